@@ -32,7 +32,7 @@ async def run_bottle_plant(args):
             frontend = ImprovedPygameFrontend("bottle", args.port)
         else:
             from sim.ui.pygame_frontend import PygameFrontend
-            frontend = PygameFrontend("bottle", args.port)
+            frontend = PygameFrontend("bottle", args.port, debug=args.debug)
         frontend.start()
     else:
         print("Bottle filling plant simulation started.")
@@ -56,7 +56,7 @@ async def run_refinery_plant(args):
             frontend = ImprovedPygameFrontend("refinery", args.port)
         else:
             from sim.ui.pygame_frontend import PygameFrontend
-            frontend = PygameFrontend("refinery", args.port)
+            frontend = PygameFrontend("refinery", args.port, debug=args.debug)
         frontend.start()
     else:
         print("Oil refinery plant simulation started.")
@@ -86,6 +86,7 @@ Examples:
     bottle_parser.add_argument('--headless', action='store_true', help='Run in headless mode')
     bottle_parser.add_argument('--gui', action='store_true', help='Run with pygame GUI')
     bottle_parser.add_argument('--improved', action='store_true', help='Use improved physics-based GUI')
+    bottle_parser.add_argument('--debug', action='store_true', help='Print key and toggle events (basic GUI only)')
     bottle_parser.add_argument('--speedup', type=float, default=1.0, help='Simulation speedup factor (default: 1.0)')
     bottle_parser.set_defaults(func=run_bottle_plant)
     
@@ -95,6 +96,7 @@ Examples:
     refinery_parser.add_argument('--headless', action='store_true', help='Run in headless mode')
     refinery_parser.add_argument('--gui', action='store_true', help='Run with pygame GUI')
     refinery_parser.add_argument('--improved', action='store_true', help='Use improved physics-based GUI')
+    refinery_parser.add_argument('--debug', action='store_true', help='Print key and toggle events (basic GUI only)')
     refinery_parser.add_argument('--speedup', type=float, default=1.0, help='Simulation speedup factor (default: 1.0)')
     refinery_parser.set_defaults(func=run_refinery_plant)
     
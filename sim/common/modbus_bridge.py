@@ -7,7 +7,7 @@ import csv
 import json
 import sys
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from pymodbus.datastore import ModbusSequentialDataBlock, ModbusServerContext
 
 class ModbusBridge:
@@ -172,6 +172,70 @@ class ModbusBridge:
         else:
             return 0
     
+    def get_tag_values(self, tag_names: List[str]) -> Dict[str, Any]:
+        """Get several tag values, reading each run of consecutive addresses in one request"""
+        # Group requested tags by table
+        by_table = {}
+        for tag_name in tag_names:
+            if tag_name not in self.tag_mappings:
+                raise ValueError(f"Unknown tag: {tag_name}")
+            mapping = self.tag_mappings[tag_name]
+            by_table.setdefault(mapping['table'], []).append((tag_name, mapping['address']))
+        
+        # Read each table's tags from its data block
+        values = {}
+        for table, tags in by_table.items():
+            if table == 'DI':
+                block = self.context[0][0]['di']
+            elif table == 'COIL':
+                block = self.context[0][0]['co']
+            elif table == 'HR':
+                block = self.context[0][0]['hr']
+            elif table == 'IR':
+                block = self.context[0][0]['ir']
+            else:
+                raise ValueError(f"Unknown table: {table}")
+            
+            # One getValues call per run of consecutive addresses
+            tags.sort(key=lambda tag: tag[1])
+            for run in self._address_runs([(address, tag_name) for tag_name, address in tags]):
+                start = run[0][0]
+                span = block.getValues(start, run[-1][0] - start + 1)
+                for address, tag_name in run:
+                    values[tag_name] = span[address - start]
+        
+        return values
+    
+    def set_tag_values(self, tag_values: Dict[str, Any]):
+        """Set several tag values, writing each run of consecutive addresses in one request"""
+        # Group writes by table, later writes to an address winning as with set_tag_value
+        by_table = {}
+        for tag_name, value in tag_values.items():
+            if tag_name not in self.tag_mappings:
+                raise ValueError(f"Unknown tag: {tag_name}")
+            mapping = self.tag_mappings[tag_name]
+            table = mapping['table']
+            if table not in ('COIL', 'HR'):
+                raise ValueError(f"Cannot write to table: {table}")
+            by_table.setdefault(table, {})[mapping['address']] = value
+        
+        # One setValues call per run of consecutive addresses
+        for table, writes in by_table.items():
+            block = self.context[0][0]['co' if table == 'COIL' else 'hr']
+            for run in self._address_runs(sorted(writes.items())):
+                block.setValues(run[0][0], [value for _, value in run])
+    
+    @staticmethod
+    def _address_runs(items: List[Tuple[int, Any]]) -> List[List[Tuple[int, Any]]]:
+        """Split address-sorted (address, payload) pairs into runs of consecutive addresses"""
+        runs = []
+        for item in items:
+            if runs and item[0] <= runs[-1][-1][0] + 1:
+                runs[-1].append(item)
+            else:
+                runs.append([item])
+        return runs
+    
     def set_tag_value(self, tag_name: str, value: Any):
         """Set tag value in Modbus context"""
         if tag_name not in self.tag_mappings:
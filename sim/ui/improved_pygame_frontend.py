@@ -3,6 +3,7 @@ Improved Pygame Frontend for VirtuaPlant
 Incorporates original physics model with pymunk and better visuals
 """
 
+import numpy as np
 import pygame
 import pymunk
 import random
@@ -16,9 +17,27 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from sim.common.modbus_bridge import ModbusBridge
 
+# Bottle segment endpoints in body-local coordinates: bottom, left side, right side
+BOTTLE_SEGMENTS = (
+    ((-50, 0), (50, 0)),
+    ((-50, 0), (-50, 150)),
+    ((50, 0), (50, 150)),
+)
+BOTTLE_ENDPOINTS = np.array(BOTTLE_SEGMENTS, dtype=float)  # shape (3, 2, 2)
+
 class ImprovedPygameFrontend:
     """Improved pygame frontend with pymunk physics"""
     
+    # Refinery valves drawn as red lines while closed
+    VALVE_NAMES = ('outlet_valve', 'sep_valve', 'waste_valve')
+    
+    # Tags read by the draw pass, fetched once per frame
+    DRAW_TAGS = {
+        "bottle": ('CMD_RUN', 'ACT_MOTOR', 'ACT_NOZZLE'),
+        "refinery": ('ACT_FEED_PUMP', 'ACT_OUTLET_VALVE', 'ACT_SEP_VALVE',
+                     'ACT_WASTE_VALVE', 'SENSOR_TANK_LEVEL'),
+    }
+    
     def __init__(self, plant_type: str, modbus_port: int = 5020):
         print(f"Initializing ImprovedPygameFrontend with plant_type: '{plant_type}'")
         self.plant_type = plant_type
@@ -61,6 +80,11 @@ class ImprovedPygameFrontend:
         self.space.iterations = 50  # Increase iterations for better collision detection
         self.space.damping = 0.8  # Add damping to reduce bouncing
         
+        # Per-frame snapshot of the tags used for drawing (only tags present in the map)
+        self._snapshot_tags = [tag for tag in self.DRAW_TAGS[plant_type]
+                               if tag in self.modbus_bridge.tag_mappings]
+        self._tag_snapshot = {}
+        
         # Physics objects
         self.bottles = []
         self.water_balls = []
@@ -128,6 +152,44 @@ class ImprovedPygameFrontend:
         self.DEEP_SKY_BLUE = pygame.color.THECOLORS['deepskyblue']
         self.DODGER_BLUE = pygame.color.THECOLORS['dodgerblue4']
         
+        # Cached sprites below are converted to the display pixel format once at
+        # creation so blitting them never needs a per-frame format conversion.
+        
+        # Status indicator HUD layer, re-rendered only when the indicated tags change
+        # (indicators are centered 30px from the right edge for bottle, 50px for refinery)
+        self.HUD_WIDTH = 30
+        indicator_x = self.SCREEN_WIDTH - (30 if plant_type == "bottle" else 50)
+        self._hud_x = indicator_x - self.HUD_WIDTH // 2
+        self._hud_layer = pygame.Surface((self.HUD_WIDTH, 105), pygame.SRCALPHA).convert_alpha()
+        self._last_hud_state = None
+        
+        # Static UI panel with branding and title baked in - smaller for refinery to show more plant
+        self.UI_WIDTH = 250 if plant_type == "refinery" else 300
+        self._ui_bg = pygame.Surface((self.UI_WIDTH, self.SCREEN_HEIGHT)).convert()
+        self._ui_bg.fill(self.WHITE)
+        self._ui_bg.blit(self.font_medium.render(f"{plant_type.title()} Plant", True, self.DEEP_SKY_BLUE), (10, 40))
+        self._ui_bg.blit(self.font_big.render("VirtuaPlant", True, self.DARK_GRAY), (10, 10))
+        
+        # Instruction lines per plant type and camera debug mode
+        self._instruction_surfs = {
+            "bottle": self.font_small.render("ESC=quit, SPACE=run, N=nozzle, M=motor, TAB=add bottle, D=debug rect, A=axes", True, self.GRAY).convert_alpha(),
+            "refinery_normal": self.font_small.render("ESC=quit, SPACE=pump, N=outlet, M=separator, D=debug rect, A=axes, C=camera", True, self.GRAY).convert_alpha(),
+            "refinery_debug": self.font_small.render("DEBUG: ARROWS=move, +/-=step, R=reset, C=exit debug", True, self.RED).convert_alpha(),
+        }
+        
+        # Composited status text strips keyed by the displayed state
+        self.STATUS_STRIP_CACHE_SIZE = 64
+        self._status_strip_cache = {}
+        
+        # Debug labels for the first bottles, rendered once
+        self.MAX_BOTTLE_LABELS = 5  # Only label the first bottles to avoid clutter
+        self._bottle_labels = [self.font_small.render(f"B{i+1}", True, self.RED).convert_alpha()
+                               for i in range(self.MAX_BOTTLE_LABELS)]
+        
+        # Bottle position indicator dot (radius 3), rasterized once
+        self._red_dot = pygame.Surface((7, 7), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.circle(self._red_dot, self.RED, (3, 3), 3)
+        
         # Setup physics
         self._setup_physics()
         
@@ -178,6 +240,7 @@ class ImprovedPygameFrontend:
         self._add_outlet_valve()
         self._add_separator_valve()
         self._add_waste_valve()
+        self._setup_valve_overlays()
         
         # Setup collision handlers
         print("Setting up refinery collision handlers...")
@@ -242,9 +305,10 @@ class ImprovedPygameFrontend:
         body.position = (bottle_x, 450)  # Raise bottles to be visible above base
         
         # Create bottle segments (left, right, bottom) - larger, more visible geometry
-        l1 = pymunk.Segment(body, (-50, 0), (50, 0), 4.0)  # bottom (100 units wide, centered)
-        l2 = pymunk.Segment(body, (-50, 0), (-50, 150), 4.0)  # left side
-        l3 = pymunk.Segment(body, (50, 0), (50, 150), 4.0)  # right side
+        bottom, left, right = BOTTLE_SEGMENTS
+        l1 = pymunk.Segment(body, *bottom, 4.0)  # bottom (100 units wide, centered)
+        l2 = pymunk.Segment(body, *left, 4.0)  # left side
+        l3 = pymunk.Segment(body, *right, 4.0)  # right side
         
         # Glass friction
         l1.friction = 0.94
@@ -514,6 +578,48 @@ class ImprovedPygameFrontend:
         self.space.add(body, shape)
         print("Waste valve physical geometry created and added to space (CLOSED)")
     
+    def _setup_valve_overlays(self):
+        """Size the closed-valve overlay to the world-space bounds of the valves"""
+        points = []
+        for name in self.VALVE_NAMES:
+            line = self.actuators[name]
+            body = line.body
+            points.append(body.position + line.a.rotated(body.angle))
+            points.append(body.position + line.b.rotated(body.angle))
+        min_x = min(p.x for p in points)
+        max_x = max(p.x for p in points)
+        min_y = min(p.y for p in points)
+        max_y = max(p.y for p in points)
+        
+        # Top-left corner in screen space is the world point with the largest y
+        self._valve_overlay_anchor = pymunk.Vec2d(min_x - 1, max_y + 1)
+        self._valve_overlay_size = (int(max_x - min_x) + 3, int(max_y - min_y) + 3)
+        # Rasterized overlays keyed by (outlet_open, sep_open, waste_open) - at most 8
+        self._valve_overlays = {}
+    
+    def _get_valve_overlay(self, key):
+        """Return the cached closed-valve overlay for a valve state key"""
+        overlay = self._valve_overlays.get(key)
+        if overlay is None:
+            overlay = self._build_valve_overlay(key)
+            self._valve_overlays[key] = overlay
+        return overlay
+    
+    def _build_valve_overlay(self, key):
+        """Rasterize the closed valves for an (outlet, sep, waste) open-state key"""
+        origin_x, origin_y = self._to_pygame(self._valve_overlay_anchor)
+        overlay = pygame.Surface(self._valve_overlay_size, pygame.SRCALPHA).convert_alpha()
+        for is_open, name in zip(key, self.VALVE_NAMES):
+            if is_open:
+                continue
+            line = self.actuators[name]
+            body = line.body
+            p1 = self._to_pygame(body.position + line.a.rotated(body.angle))
+            p2 = self._to_pygame(body.position + line.b.rotated(body.angle))
+            pygame.draw.lines(overlay, self.RED, False,
+                              [(p1[0] - origin_x, p1[1] - origin_y), (p2[0] - origin_x, p2[1] - origin_y)])
+        return overlay
+    
     def _add_tank_level_sensor(self):
         """Add tank level sensor - EXACT original"""
         body = pymunk.Body(body_type=pymunk.Body.STATIC)
@@ -909,6 +1015,23 @@ class ImprovedPygameFrontend:
         else:  # refinery - center the view
             return int(p.x + self.CAMERA_X), int(self.SCREEN_HEIGHT - (p.y - self.CAMERA_Y))
     
+    def _to_pygame_batch(self, points):
+        """Convert an (N, 2) array of world coordinates to integer screen coordinates"""
+        screen = np.empty_like(points)
+        screen[:, 0] = points[:, 0] if self.plant_type == "bottle" else points[:, 0] + self.CAMERA_X
+        screen[:, 1] = self.SCREEN_HEIGHT - (points[:, 1] - self.CAMERA_Y)
+        return screen.astype(int)  # truncates toward zero like int()
+    
+    def _bottle_endpoints(self, body):
+        """World-space endpoints of a bottle's segments as a (3, 2, 2) array"""
+        cos_a, sin_a = np.cos(body.angle), np.sin(body.angle)
+        local_x = BOTTLE_ENDPOINTS[..., 0]
+        local_y = BOTTLE_ENDPOINTS[..., 1]
+        endpoints = np.empty_like(BOTTLE_ENDPOINTS)
+        endpoints[..., 0] = body.position.x + local_x * cos_a - local_y * sin_a
+        endpoints[..., 1] = body.position.y + local_x * sin_a + local_y * cos_a
+        return endpoints
+    
     def _to_world(self, screen_x, screen_y):
         """Convert pygame screen coordinates to pymunk world coordinates"""
         if self.plant_type == "bottle":
@@ -1218,8 +1341,20 @@ class ImprovedPygameFrontend:
                 self.space.remove(ball, ball.body)
             self.oil_balls = [ball for ball in self.oil_balls if ball not in balls_to_remove]
     
+    def _refresh_tag_snapshot(self):
+        """Read all draw-time tags in one batched Modbus access"""
+        self._tag_snapshot = self.modbus_bridge.get_tag_values(self._snapshot_tags)
+    
+    def _snapshot_value(self, tag_name):
+        """Get a tag value from this frame's snapshot"""
+        try:
+            return self._tag_snapshot[tag_name]
+        except KeyError:
+            return self.modbus_bridge.get_tag_value(tag_name)
+    
     def _draw(self):
         """Draw the plant visualization"""
+        self._refresh_tag_snapshot()
         self.screen.fill(self.WHITE)
         
         if self.plant_type == "bottle":
@@ -1239,40 +1374,33 @@ class ImprovedPygameFrontend:
             self._draw_ball(self.screen, ball, self.BLUE)
         
         # Draw bottles
+        labels = []
+        dots = []
         for i, bottle in enumerate(self.bottles):
             self._draw_lines(self.screen, bottle[:3], self.DODGER_BLUE)
             
-            # Debug: Draw bottle position indicator
+            # Debug: Queue bottle position indicator
             screen_pos = self._to_pygame(bottle[3].position)
-            pygame.draw.circle(self.screen, self.RED, screen_pos, 3)
+            dots.append((self._red_dot, (screen_pos[0] - 3, screen_pos[1] - 3)))
             
-            # Debug: Draw bottle number
-            if i < 5:  # Only show first 5 bottles to avoid clutter
-                text = self.font_small.render(f"B{i+1}", True, self.RED)
-                self.screen.blit(text, (screen_pos[0] + 10, screen_pos[1] - 10))
+            # Debug: Queue bottle number label
+            if i < self.MAX_BOTTLE_LABELS:
+                labels.append((self._bottle_labels[i], (screen_pos[0] + 10, screen_pos[1] - 10)))
             
             # Debug: Draw bottle AABB rectangle
             if self.show_debug_rectangles:
                 # Calculate AABB for bottle segments
-                min_x = min_y = float('inf')
-                max_x = max_y = float('-inf')
-                
-                for segment in bottle[:3]:
-                    body = segment.body
-                    p1 = body.position + segment.a.rotated(body.angle)
-                    p2 = body.position + segment.b.rotated(body.angle)
-                    screen_p1 = self._to_pygame(p1)
-                    screen_p2 = self._to_pygame(p2)
-                    
-                    min_x = min(min_x, screen_p1[0], screen_p2[0])
-                    max_x = max(max_x, screen_p1[0], screen_p2[0])
-                    min_y = min(min_y, screen_p1[1], screen_p2[1])
-                    max_y = max(max_y, screen_p1[1], screen_p2[1])
+                endpoints = self._bottle_endpoints(bottle[3])
+                screen_pts = self._to_pygame_batch(endpoints.reshape(-1, 2)).reshape(3, 2, 2)
+                min_x, min_y = screen_pts.min(axis=(0, 1))
+                max_x, max_y = screen_pts.max(axis=(0, 1))
                 
                 # Draw AABB rectangle
-                if min_x != float('inf'):
-                    rect = pygame.Rect(min_x - 2, min_y - 2, max_x - min_x + 4, max_y - min_y + 4)
-                    pygame.draw.rect(self.screen, self.GREEN, rect, 1)
+                rect = pygame.Rect(min_x - 2, min_y - 2, max_x - min_x + 4, max_y - min_y + 4)
+                pygame.draw.rect(self.screen, self.GREEN, rect, 1)
+        
+        # Debug: Draw all bottle position dots and number labels in one batch
+        self.screen.blits(dots + labels, doreturn=False)
         
         # Draw base and nozzle
         self._draw_polygon(self.screen, self.actuators['base'], self.BLACK)
@@ -1321,17 +1449,13 @@ class ImprovedPygameFrontend:
         self._draw_ball(self.screen, self.sensors['tank_level'], self.BLACK)
         
         # Draw valves as lines - only show when closed (RE-ENABLED)
-        outlet_valve = self.modbus_bridge.get_tag_value('ACT_OUTLET_VALVE')
-        sep_valve = self.modbus_bridge.get_tag_value('ACT_SEP_VALVE')
-        waste_valve = self.modbus_bridge.get_tag_value('ACT_WASTE_VALVE')
+        outlet_valve = self._snapshot_value('ACT_OUTLET_VALVE')
+        sep_valve = self._snapshot_value('ACT_SEP_VALVE')
+        waste_valve = self._snapshot_value('ACT_WASTE_VALVE')
         
         # Only draw valves when they are closed (blocking flow)
-        if not outlet_valve:
-            self._draw_line(self.screen, self.actuators['outlet_valve'], self.RED)
-        if not sep_valve:
-            self._draw_line(self.screen, self.actuators['sep_valve'], self.RED)
-        if not waste_valve:
-            self._draw_line(self.screen, self.actuators['waste_valve'], self.RED)
+        valve_key = (bool(outlet_valve), bool(sep_valve), bool(waste_valve))
+        self.screen.blit(self._get_valve_overlay(valve_key), self._to_pygame(self._valve_overlay_anchor))
         
         # Draw spill and processed sensors
         self._draw_line(self.screen, self.sensors['spill_sensor'], self.RED)
@@ -1346,60 +1470,48 @@ class ImprovedPygameFrontend:
     def _draw_status_indicators(self):
         """Draw status indicators"""
         if self.plant_type == "bottle":
-            # Bottle plant status indicators
-            # Run status
-            run_cmd = self.modbus_bridge.get_tag_value('CMD_RUN')
-            status_color = self.GREEN if run_cmd else self.RED
-            pygame.draw.circle(self.screen, status_color, (self.SCREEN_WIDTH - 30, 30), 15)
-            
-            # Motor status
-            motor_on = self.modbus_bridge.get_tag_value('ACT_MOTOR')
-            motor_color = self.GREEN if motor_on else self.RED
-            pygame.draw.circle(self.screen, motor_color, (self.SCREEN_WIDTH - 30, 60), 10)
-            
-            # Nozzle status
-            nozzle_open = self.modbus_bridge.get_tag_value('ACT_NOZZLE')
-            nozzle_color = self.GREEN if nozzle_open else self.RED
-            pygame.draw.circle(self.screen, nozzle_color, (self.SCREEN_WIDTH - 30, 90), 10)
+            # Bottle plant status indicators: run, motor, nozzle
+            hud_state = (
+                bool(self._snapshot_value('CMD_RUN')),
+                bool(self._snapshot_value('ACT_MOTOR')),
+                bool(self._snapshot_value('ACT_NOZZLE')),
+            )
         else:
-            # Refinery status indicators - positioned for larger screen
-            # Feed pump status
-            feed_pump = self.modbus_bridge.get_tag_value('ACT_FEED_PUMP')
-            pump_color = self.GREEN if feed_pump else self.RED
-            pygame.draw.circle(self.screen, pump_color, (self.SCREEN_WIDTH - 50, 30), 15)
-            
-            # Outlet valve status
-            outlet_valve = self.modbus_bridge.get_tag_value('ACT_OUTLET_VALVE')
-            outlet_color = self.GREEN if outlet_valve else self.RED
-            pygame.draw.circle(self.screen, outlet_color, (self.SCREEN_WIDTH - 50, 60), 10)
-            
-            # Separator valve status
-            sep_valve = self.modbus_bridge.get_tag_value('ACT_SEP_VALVE')
-            sep_color = self.GREEN if sep_valve else self.RED
-            pygame.draw.circle(self.screen, sep_color, (self.SCREEN_WIDTH - 50, 90), 10)
+            # Refinery status indicators: feed pump, outlet valve, separator valve
+            hud_state = (
+                bool(self._snapshot_value('ACT_FEED_PUMP')),
+                bool(self._snapshot_value('ACT_OUTLET_VALVE')),
+                bool(self._snapshot_value('ACT_SEP_VALVE')),
+            )
+        
+        # Only re-rasterize the indicator lamps when a tag actually changed
+        if hud_state != self._last_hud_state:
+            self._render_hud_layer(hud_state)
+            self._last_hud_state = hud_state
+        
+        self.screen.blit(self._hud_layer, (self._hud_x, 0))
+    
+    def _render_hud_layer(self, hud_state):
+        """Rasterize the status indicator lamps onto the HUD layer"""
+        self._hud_layer.fill((0, 0, 0, 0))
+        center_x = self.HUD_WIDTH // 2
+        radii = (15, 10, 10)
+        for i, (active, radius) in enumerate(zip(hud_state, radii)):
+            color = self.GREEN if active else self.RED
+            pygame.draw.circle(self._hud_layer, color, (center_x, 30 + i * 30), radius)
     
     def _draw_ui(self):
         """Draw UI elements"""
-        # Clear UI area - smaller for refinery to show more plant
-        ui_width = 250 if self.plant_type == "refinery" else 300
-        pygame.draw.rect(self.screen, self.WHITE, (0, 0, ui_width, self.SCREEN_HEIGHT))
-        
-        # Title
-        title = self.font_medium.render(f"{self.plant_type.title()} Plant", True, self.DEEP_SKY_BLUE)
-        self.screen.blit(title, (10, 40))
-        
-        # VirtuaPlant branding
-        name = self.font_big.render("VirtuaPlant", True, self.DARK_GRAY)
-        self.screen.blit(name, (10, 10))
+        # Clear UI area and draw branding/title from the static panel
+        self.screen.blit(self._ui_bg, (0, 0))
         
         # Instructions
         if self.plant_type == "bottle":
-            instructions = self.font_small.render("ESC=quit, SPACE=run, N=nozzle, M=motor, TAB=add bottle, D=debug rect, A=axes", True, self.GRAY)
+            instructions = self._instruction_surfs["bottle"]
+        elif self.debug_mode:
+            instructions = self._instruction_surfs["refinery_debug"]
         else:
-            if self.debug_mode:
-                instructions = self.font_small.render("DEBUG: ARROWS=move, +/-=step, R=reset, C=exit debug", True, self.RED)
-            else:
-                instructions = self.font_small.render("ESC=quit, SPACE=pump, N=outlet, M=separator, D=debug rect, A=axes, C=camera", True, self.GRAY)
+            instructions = self._instruction_surfs["refinery_normal"]
         self.screen.blit(instructions, (self.SCREEN_WIDTH - 500, 10))
         
         # Status information
@@ -1441,32 +1553,23 @@ class ImprovedPygameFrontend:
         y_offset = 70
         
         if self.plant_type == "bottle":
-            # Bottle plant status text
-            # Run command status
-            run_cmd = self.modbus_bridge.get_tag_value('CMD_RUN')
-            run_color = self.GREEN if run_cmd else self.RED
-            run_text = self.font_big.render(f"RUN: {'ON' if run_cmd else 'OFF'}", True, run_color)
-            self.screen.blit(run_text, (10, y_offset))
-            
-            # Motor status
-            motor_on = self.modbus_bridge.get_tag_value('ACT_MOTOR')
-            motor_color = self.GREEN if motor_on else self.RED
-            motor_text = self.font_medium.render(f"MOTOR: {'ON' if motor_on else 'OFF'}", True, motor_color)
-            self.screen.blit(motor_text, (10, y_offset + 40))
-            
-            # Nozzle status
-            nozzle_open = self.modbus_bridge.get_tag_value('ACT_NOZZLE')
-            nozzle_color = self.GREEN if nozzle_open else self.RED
-            nozzle_text = self.font_medium.render(f"NOZZLE: {'OPEN' if nozzle_open else 'CLOSED'}", True, nozzle_color)
-            self.screen.blit(nozzle_text, (10, y_offset + 70))
+            # Bottle plant status text: run, motor, nozzle, bottle and water counts
+            run_cmd = bool(self._snapshot_value('CMD_RUN'))
+            motor_on = bool(self._snapshot_value('ACT_MOTOR'))
+            nozzle_open = bool(self._snapshot_value('ACT_NOZZLE'))
+            strip_key = ("bottle", run_cmd, motor_on, nozzle_open, len(self.bottles), len(self.water_balls))
+            strip = self._status_strip_cache.get(strip_key)
+            if strip is None:
+                strip = self._build_status_strip([
+                    (self.font_big, f"RUN: {'ON' if run_cmd else 'OFF'}", self.GREEN if run_cmd else self.RED, 0),
+                    (self.font_medium, f"MOTOR: {'ON' if motor_on else 'OFF'}", self.GREEN if motor_on else self.RED, 40),
+                    (self.font_medium, f"NOZZLE: {'OPEN' if nozzle_open else 'CLOSED'}", self.GREEN if nozzle_open else self.RED, 70),
+                    (self.font_medium, f"Bottles: {len(self.bottles)}", self.BLACK, 100),
+                    (self.font_medium, f"Water drops: {len(self.water_balls)}", self.BLACK, 130),
+                ])
+                self._cache_status_strip(strip_key, strip)
+            self.screen.blit(strip, (10, y_offset))
             
-            # Bottle count
-            bottle_text = self.font_medium.render(f"Bottles: {len(self.bottles)}", True, self.BLACK)
-            self.screen.blit(bottle_text, (10, y_offset + 100))
-            
-            # Water balls count
-            water_text = self.font_medium.render(f"Water drops: {len(self.water_balls)}", True, self.BLACK)
-            self.screen.blit(water_text, (10, y_offset + 130))
             # Debug: Show total balls created
             total_balls = getattr(self, 'total_balls_created', 0)
             total_text = self.font_small.render(f"Total created: {total_balls}", True, self.RED)
@@ -1480,39 +1583,48 @@ class ImprovedPygameFrontend:
                 coord_text = self.font_small.render(f"B1: world({world_pos.x:.1f},{world_pos.y:.1f}) screen({screen_pos[0]},{screen_pos[1]})", True, self.BLUE)
                 self.screen.blit(coord_text, (10, y_offset + 180))
         else:
-            # Refinery status text
-            # Feed pump status
-            feed_pump = self.modbus_bridge.get_tag_value('ACT_FEED_PUMP')
-            pump_color = self.GREEN if feed_pump else self.RED
-            pump_text = self.font_big.render(f"FEED PUMP: {'ON' if feed_pump else 'OFF'}", True, pump_color)
-            self.screen.blit(pump_text, (10, y_offset))
-            
-            # Outlet valve status
-            outlet_valve = self.modbus_bridge.get_tag_value('ACT_OUTLET_VALVE')
-            outlet_color = self.GREEN if outlet_valve else self.RED
-            outlet_text = self.font_medium.render(f"OUTLET: {'OPEN' if outlet_valve else 'CLOSED'}", True, outlet_color)
-            self.screen.blit(outlet_text, (10, y_offset + 40))
-            
-            # Separator valve status
-            sep_valve = self.modbus_bridge.get_tag_value('ACT_SEP_VALVE')
-            sep_color = self.GREEN if sep_valve else self.RED
-            sep_text = self.font_medium.render(f"SEPARATOR: {'OPEN' if sep_valve else 'CLOSED'}", True, sep_color)
-            self.screen.blit(sep_text, (10, y_offset + 70))
-            
-            # Oil balls count
-            oil_text = self.font_medium.render(f"Oil drops: {len(self.oil_balls)}", True, self.BLACK)
-            self.screen.blit(oil_text, (10, y_offset + 100))
-            
-            # Tank level
-            tank_level = self.modbus_bridge.get_tag_value('SENSOR_TANK_LEVEL')
-            tank_text = self.font_medium.render(f"Tank Level: {tank_level}", True, self.BLACK)
-            self.screen.blit(tank_text, (10, y_offset + 130))
+            # Refinery status text: feed pump, outlet, separator, oil count, tank level
+            feed_pump = bool(self._snapshot_value('ACT_FEED_PUMP'))
+            outlet_valve = bool(self._snapshot_value('ACT_OUTLET_VALVE'))
+            sep_valve = bool(self._snapshot_value('ACT_SEP_VALVE'))
+            tank_level = self._snapshot_value('SENSOR_TANK_LEVEL')
+            strip_key = ("refinery", feed_pump, outlet_valve, sep_valve, len(self.oil_balls), tank_level)
+            strip = self._status_strip_cache.get(strip_key)
+            if strip is None:
+                strip = self._build_status_strip([
+                    (self.font_big, f"FEED PUMP: {'ON' if feed_pump else 'OFF'}", self.GREEN if feed_pump else self.RED, 0),
+                    (self.font_medium, f"OUTLET: {'OPEN' if outlet_valve else 'CLOSED'}", self.GREEN if outlet_valve else self.RED, 40),
+                    (self.font_medium, f"SEPARATOR: {'OPEN' if sep_valve else 'CLOSED'}", self.GREEN if sep_valve else self.RED, 70),
+                    (self.font_medium, f"Oil drops: {len(self.oil_balls)}", self.BLACK, 100),
+                    (self.font_medium, f"Tank Level: {tank_level}", self.BLACK, 130),
+                ])
+                self._cache_status_strip(strip_key, strip)
+            self.screen.blit(strip, (10, y_offset))
             
             # Camera position (debug info)
             if self.debug_mode:
                 camera_text = self.font_small.render(f"Camera: X={self.CAMERA_X}, Y={self.CAMERA_Y}, Step={self.camera_step}", True, self.BLUE)
                 self.screen.blit(camera_text, (10, y_offset + 160))
     
+    def _build_status_strip(self, lines):
+        """Composite (font, text, color, y) status lines onto one opaque surface"""
+        rendered = [(font.render(text, True, color), y) for font, text, color, y in lines]
+        width = max(surface.get_width() for surface, _ in rendered)
+        height = max(y + surface.get_height() for surface, y in rendered)
+        
+        # Opaque white matches the cleared UI panel the strip is drawn onto
+        strip = pygame.Surface((width, height)).convert()
+        strip.fill(self.WHITE)
+        for surface, y in rendered:
+            strip.blit(surface, (0, y))
+        return strip
+    
+    def _cache_status_strip(self, key, strip):
+        """Store a status strip, dropping old entries once the cache is full"""
+        if len(self._status_strip_cache) >= self.STATUS_STRIP_CACHE_SIZE:
+            self._status_strip_cache.clear()
+        self._status_strip_cache[key] = strip
+    
     def _toggle_run(self):
         """Toggle run command"""
         try:
@@ -4,8 +4,10 @@ Pygame Frontend for VirtuaPlant Simulator
 """
 
 import pygame
+import numpy as np
 import asyncio
 import sys
+import time
 from typing import Dict, Any, Optional
 from pathlib import Path
 
@@ -14,14 +16,134 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from sim.common.modbus_bridge import ModbusBridge
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function as plain Python"""
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True)
+def _tick_bottles(bpos, blevel, bfilled, water, water_n, motor_on, nozzle_open, run_cmd, width, height):
+    """Advance bottles and water drops in place, returning the live drop count"""
+    # Update bottle positions (only if run command is active)
+    if motor_on and run_cmd:
+        bpos += 0.5  # Faster movement
+    elif run_cmd:
+        bpos += 0.1  # Slow movement even without motor
+    
+    # Reset bottles that went off screen
+    wrap = bpos > width + 150
+    bpos[wrap] = 130
+    blevel[wrap] = 0.0
+    bfilled[wrap] = False
+    
+    # Update bottle levels (only for bottles in filling position)
+    if nozzle_open:
+        in_fill = (bpos >= 130) & (bpos <= 200)
+    else:
+        in_fill = np.zeros_like(bfilled)
+    blevel[in_fill] = np.minimum(1.0, blevel[in_fill] + 0.1)
+    
+    # Mark as filled when level is high enough
+    bfilled |= in_fill & (blevel >= 0.8)
+    
+    # Natural drain
+    drain = ~in_fill
+    blevel[drain] = np.maximum(0.0, blevel[drain] - 0.02)
+    
+    # Add water drops for filling bottles, in bottle order
+    spawn = np.flatnonzero(in_fill)[:water.shape[0] - water_n]
+    if spawn.size:
+        new = water[water_n:water_n + spawn.size]
+        new[:, 0] = 180 + (bpos[spawn] - 130) * 0.1
+        new[:, 1] = 430
+        new[:, 2] = 0
+        new[:, 3] = 2
+        water_n += spawn.size
+    
+    # Update water drops and compact the survivors to the front
+    live = water[:water_n]
+    live[:, 1] += live[:, 3]
+    keep = (live[:, 1] <= height) & (live[:, 1] >= 150)
+    kept = live[keep]
+    water[:len(kept)] = kept
+    water_n = len(kept)
+    
+    return water_n
+
+
+@njit(cache=True)
+def _tick_refinery(tank_level, oil_processed, oil_spilled, oil, oil_n, feed_pump_on,
+                   outlet_valve_open, sep_valve_open, waste_valve_open, height):
+    """Advance the tank and oil drops by one step, returning the new totals and drop count"""
+    # Update tank level
+    if feed_pump_on:
+        tank_level += 0.2
+        tank_level = min(100.0, tank_level)
+        
+        # Add oil drops
+        if oil_n < oil.shape[0]:
+            oil[oil_n, 0] = 70
+            oil[oil_n, 1] = 565
+            oil[oil_n, 2] = 0
+            oil[oil_n, 3] = 1.5
+            oil_n += 1
+    
+    # Process oil
+    if outlet_valve_open and sep_valve_open:
+        process_rate = min(0.1, tank_level)
+        tank_level -= process_rate
+        oil_processed += process_rate
+    
+    # Empty tank
+    if waste_valve_open:
+        empty_rate = 0.15
+        tank_level -= empty_rate
+        tank_level = max(0.0, tank_level)
+    
+    # Check for spills
+    if tank_level > 100.0:
+        spill_amount = tank_level - 100.0
+        oil_spilled += spill_amount
+        tank_level = 100.0
+    
+    # Update oil drops and compact the survivors to the front
+    live = oil[:oil_n]
+    live[:, 1] += live[:, 3]
+    keep = (live[:, 1] <= height) & (live[:, 1] >= 100)
+    kept = live[keep]
+    oil[:len(kept)] = kept
+    oil_n = len(kept)
+    
+    return tank_level, oil_processed, oil_spilled, oil_n
+
+
 class PygameFrontend:
     """2D pygame frontend for plant visualization"""
     
-    def __init__(self, plant_type: str, modbus_port: int = 5020):
+    def __init__(self, plant_type: str, modbus_port: int = 5020, debug: bool = False):
         self.plant_type = plant_type
         self.modbus_port = modbus_port
         self.modbus_bridge = ModbusBridge(plant_type)
         
+        # Per-frame snapshot of actuators and the run command, read once per loop
+        self._snapshot_tags = [tag for tag, mapping in self.modbus_bridge.tag_mappings.items()
+                               if mapping['role'] == 'Actuator' or tag == 'CMD_RUN']
+        self._tag_snap = {}
+        
+        # Last sensor values written to the bridge, to skip unchanged writes
+        self._last_sensors = {}
+        
+        # Signature of the last drawn state, used to skip unchanged frames
+        self._prev_sig = None
+        
         # Screen dimensions (from existing world.py files)
         if plant_type == "bottle":
             self.SCREEN_WIDTH = 600
@@ -32,25 +154,35 @@ class PygameFrontend:
         
         self.FPS = 50
         self.running = False
+        self.debug = debug  # Print key and toggle events
         
-        # Physics state
-        self.bottles = [
-            {'position': 130.0, 'level': 0.0, 'filled': False},
-            {'position': 130.0, 'level': 0.0, 'filled': False},
-            {'position': 130.0, 'level': 0.0, 'filled': False}
-        ]
+        # Physics state (one array per bottle field)
+        self.NUM_BOTTLES = 3
+        self.bpos, self.blevel, self.bfilled = self._make_bottle_arrays(self.NUM_BOTTLES)
         self.current_bottle = 0
         self.tank_level = 20.0
         self.oil_spilled = 0.0
         self.oil_processed = 0.0
         
-        # Visual elements
-        self.water_drops = []
-        self.oil_drops = []
+        # Visual elements (drop rows are x, y, vx, vy)
+        self.MAX_WATER_DROPS = 15
+        self.water = np.zeros((self.MAX_WATER_DROPS, 4))
+        self.water_n = 0
+        self.MAX_OIL_DROPS = 15
+        self.oil = np.zeros((self.MAX_OIL_DROPS, 4))
+        self.oil_n = 0
+        
+        # Compile the physics kernels up front so the first frame is not slow
+        if NUMBA_AVAILABLE:
+            _tick_bottles(self.bpos.copy(), self.blevel.copy(), self.bfilled.copy(), self.water.copy(),
+                          0, False, False, False, self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
+            _tick_refinery(0.0, 0.0, 0.0, self.oil.copy(), 0, False, False, False, False,
+                           self.SCREEN_HEIGHT)
         
         # Initialize pygame
         pygame.init()
-        self.screen = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+        self.screen = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT),
+                                              pygame.DOUBLEBUF, vsync=0)
         pygame.display.set_caption(f"VirtuaPlant - {plant_type.title()} Plant")
         
         # Fonts
@@ -68,6 +200,61 @@ class PygameFrontend:
         self.GRAY = (128, 128, 128)
         self.DARK_GRAY = (64, 64, 64)
         
+        # Pre-rendered circle sprites keyed by (color, radius)
+        self._dots = {}
+        for color in (self.GREEN, self.RED):
+            for radius in (5, 10, 15):
+                self._dots[(color, radius)] = self._make_dot(color, radius)
+        self._dots[(self.BLUE, 3)] = self._make_dot(self.BLUE, 3)
+        self._dots[(self.BROWN, 2)] = self._make_dot(self.BROWN, 2)
+        
+        # Rendered text surfaces keyed by (font, text, color)
+        self.TEXT_CACHE_SIZE = 256
+        self._text_cache = {}
+        
+        # Static text rendered once
+        self._title_surf = self.font_medium.render(f"{plant_type.title()} Plant", True, self.BLACK).convert_alpha()
+        self._name_surf = self.font_big.render("VirtuaPlant", True, self.DARK_GRAY).convert_alpha()
+        self._instructions_surf = self.font_small.render("ESC=quit, SPACE=run, N=nozzle, M=motor, TAB=bottle", True, self.GRAY).convert_alpha()
+        
+        # Static background: white screen with the plant base
+        base_y = 300 if plant_type == "bottle" else 400
+        self._bg = pygame.Surface((self.SCREEN_WIDTH, self.SCREEN_HEIGHT)).convert()
+        self._bg.fill(self.WHITE)
+        pygame.draw.rect(self._bg, self.BLACK, (0, base_y, self.SCREEN_WIDTH, 20))
+        
+        # Screen regions that can change between frames; everything else is
+        # static background pushed by the first full flip
+        if plant_type == "bottle":
+            self._dirty_rects = [
+                pygame.Rect(0, 0, 300, self.SCREEN_HEIGHT),             # UI pane
+                pygame.Rect(0, 175, self.SCREEN_WIDTH, 135),            # bottles and labels
+                pygame.Rect(self.SCREEN_WIDTH - 45, 15, 30, 90),        # status indicators
+            ]
+        else:
+            self._dirty_rects = [
+                pygame.Rect(0, 0, 300, self.SCREEN_HEIGHT),             # UI pane
+                pygame.Rect(300, 200, self.SCREEN_WIDTH - 300, 30),     # separator and valve
+            ]
+        
+        # Static UI panel: cleared area with title and branding
+        self._ui_bg = pygame.Surface((300, self.SCREEN_HEIGHT)).convert()
+        self._ui_bg.fill(self.WHITE)
+        self._ui_bg.blit(self._title_surf, (10, 40))
+        self._ui_bg.blit(self._name_surf, (10, 10))
+        
+        # Plant type is fixed, so bind the per-plant methods once
+        if plant_type == "bottle":
+            self._update_impl = self._update_bottle_physics
+            self._draw_plant = self._draw_bottle_plant
+            self._draw_status = self._draw_bottle_status
+            self._state_signature = self._bottle_signature
+        else:
+            self._update_impl = self._update_refinery_physics
+            self._draw_plant = self._draw_refinery_plant
+            self._draw_status = self._draw_refinery_status
+            self._state_signature = self._refinery_signature
+        
     def start(self):
         """Start the pygame frontend"""
         self.running = True
@@ -79,103 +266,111 @@ class PygameFrontend:
             # Handle events
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    print("Quit event received")
+                    if self.debug:
+                        print("Quit event received")
                     self.running = False
                 elif event.type == pygame.KEYDOWN:
-                    print(f"Key pressed: {event.key}")
+                    if self.debug:
+                        print(f"Key pressed: {event.key}")
                     if event.key == pygame.K_ESCAPE:
-                        print("ESC pressed - quitting")
+                        if self.debug:
+                            print("ESC pressed - quitting")
                         self.running = False
                     elif event.key == pygame.K_SPACE:
-                        print("SPACE pressed - toggling run")
+                        if self.debug:
+                            print("SPACE pressed - toggling run")
                         self._toggle_run()
                     elif event.key == pygame.K_n:
-                        print("N pressed - toggling nozzle")
+                        if self.debug:
+                            print("N pressed - toggling nozzle")
                         self._toggle_nozzle()
                     elif event.key == pygame.K_m:
-                        print("M pressed - toggling motor")
+                        if self.debug:
+                            print("M pressed - toggling motor")
                         self._toggle_motor()
                     elif event.key == pygame.K_TAB:
-                        print("TAB pressed - switching bottle")
+                        if self.debug:
+                            print("TAB pressed - switching bottle")
                         self._switch_bottle()
             
+            # Read all tags once for this frame
+            self._refresh_tags()
+            
             # Update physics and get sensor values
             self._update_physics()
             
-            # Draw everything
-            self._draw()
-            
-            # Update display
-            pygame.display.flip()
+            # Redraw only when the visible state changed
+            state_sig = self._state_signature()
+            if state_sig != self._prev_sig:
+                # Draw everything
+                self._draw()
+                
+                # Update display (full flip for the first frame, then only the
+                # regions that can change)
+                if self._prev_sig is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(self._dirty_rects)
+                self._prev_sig = state_sig
             clock.tick(self.FPS)
         
         pygame.quit()
     
+    @staticmethod
+    def _make_bottle_arrays(count: int):
+        """Create position, level and filled arrays for a fixed number of bottles"""
+        return np.full(count, 130.0), np.zeros(count), np.zeros(count, dtype=bool)
+    
+    @property
+    def bottles(self):
+        """Per-bottle dicts built from the bottle arrays (read-only snapshot)"""
+        return [{'position': float(self.bpos[i]), 'level': float(self.blevel[i]),
+                 'filled': bool(self.bfilled[i])} for i in range(self.NUM_BOTTLES)]
+    
     def _update_physics(self):
         """Update physics simulation"""
-        # Get actuator values from Modbus
-        actuator_values = self.modbus_bridge.get_actuator_values()
-        
-        if self.plant_type == "bottle":
-            self._update_bottle_physics(actuator_values)
-        else:
-            self._update_refinery_physics(actuator_values)
+        # Actuator values come from this frame's tag snapshot
+        self._update_impl(self._tag_snap)
+    
+    def _bottle_signature(self):
+        """Summarize everything the next bottle frame would draw"""
+        flash = int(time.time() * 2) % 2 if self._tag_snap.get('CMD_RUN') else 0
+        return (self.bpos.tobytes(), self.blevel.tobytes(), self.bfilled.tobytes(),
+                self.water[:self.water_n].tobytes(), self.current_bottle,
+                tuple(self._tag_snap.items()), flash)
+    
+    def _refinery_signature(self):
+        """Summarize everything the next refinery frame would draw"""
+        return (self.tank_level, self.oil_processed, self.oil_spilled,
+                self.oil[:self.oil_n].tobytes(), tuple(self._tag_snap.items()))
+    
+    def _refresh_tags(self):
+        """Read actuator and command tags in one batched Modbus access"""
+        self._tag_snap = self.modbus_bridge.get_tag_values(self._snapshot_tags)
+    
+    def _snapshot_value(self, tag_name):
+        """Get a tag value from this frame's snapshot"""
+        try:
+            return self._tag_snap[tag_name]
+        except KeyError:
+            return self.modbus_bridge.get_tag_value(tag_name)
     
     def _update_bottle_physics(self, actuator_values: Dict[str, Any]):
         """Update bottle filling physics"""
         motor_on = actuator_values.get('ACT_MOTOR', False)
         nozzle_open = actuator_values.get('ACT_NOZZLE', False)
-        run_cmd = self.modbus_bridge.get_tag_value('CMD_RUN')
-        
-        # Update all bottles
-        for i, bottle in enumerate(self.bottles):
-            # Update bottle position (only if run command is active)
-            if motor_on and run_cmd:
-                bottle['position'] += 0.5  # Faster movement
-            elif run_cmd:
-                bottle['position'] += 0.1  # Slow movement even without motor
-            
-            # Reset bottle when it goes off screen
-            if bottle['position'] > self.SCREEN_WIDTH + 150:
-                bottle['position'] = 130
-                bottle['level'] = 0.0
-                bottle['filled'] = False
-            
-            # Update bottle level (only for bottle in filling position)
-            if nozzle_open and 130 <= bottle['position'] <= 200:
-                bottle['level'] += 0.1
-                bottle['level'] = min(1.0, bottle['level'])
-                
-                # Mark as filled when level is high enough
-                if bottle['level'] >= 0.8:
-                    bottle['filled'] = True
-                
-                # Add water drops
-                if len(self.water_drops) < 15:
-                    self.water_drops.append({
-                        'x': 180 + (bottle['position'] - 130) * 0.1,
-                        'y': 430,
-                        'vx': 0,
-                        'vy': 2
-                    })
-            else:
-                # Natural drain
-                if bottle['level'] > 0:
-                    bottle['level'] -= 0.02
-                    bottle['level'] = max(0.0, bottle['level'])
+        run_cmd = self._snapshot_value('CMD_RUN')
         
-        # Update water drops
-        for drop in self.water_drops[:]:
-            drop['y'] += drop['vy']
-            if drop['y'] > self.SCREEN_HEIGHT or drop['y'] < 150:
-                self.water_drops.remove(drop)
+        self.water_n = _tick_bottles(self.bpos, self.blevel, self.bfilled, self.water, self.water_n,
+                                     bool(motor_on), bool(nozzle_open), bool(run_cmd),
+                                     self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
         
         # Update sensor values based on current bottle
-        current_bottle = self.bottles[self.current_bottle]
-        bottle_in_position = 130 <= current_bottle['position'] <= 200
-        bottle_filled = current_bottle['filled']
+        position = self.bpos[self.current_bottle]
+        bottle_in_position = bool(130 <= position <= 200)
+        bottle_filled = bool(self.bfilled[self.current_bottle])
         
-        self.modbus_bridge.update_sensors({
+        self._write_sensors({
             'SENSOR_LIMIT_SWITCH': bottle_in_position,
             'SENSOR_LEVEL_SENSOR': bottle_filled
         })
@@ -187,162 +382,160 @@ class PygameFrontend:
         sep_valve_open = actuator_values.get('ACT_SEP_VALVE', False)
         waste_valve_open = actuator_values.get('ACT_WASTE_VALVE', False)
         
-        # Update tank level
-        if feed_pump_on:
-            self.tank_level += 0.2
-            self.tank_level = min(100.0, self.tank_level)
-            
-            # Add oil drops
-            if len(self.oil_drops) < 15:
-                self.oil_drops.append({
-                    'x': 70,
-                    'y': 565,
-                    'vx': 0,
-                    'vy': 1.5
-                })
-        
-        # Process oil
-        if outlet_valve_open and sep_valve_open:
-            process_rate = min(0.1, self.tank_level)
-            self.tank_level -= process_rate
-            self.oil_processed += process_rate
-        
-        # Empty tank
-        if waste_valve_open:
-            empty_rate = 0.15
-            self.tank_level -= empty_rate
-            self.tank_level = max(0.0, self.tank_level)
-        
-        # Check for spills
-        if self.tank_level > 100.0:
-            spill_amount = self.tank_level - 100.0
-            self.oil_spilled += spill_amount
-            self.tank_level = 100.0
-        
-        # Update oil drops
-        for drop in self.oil_drops[:]:
-            drop['y'] += drop['vy']
-            if drop['y'] > self.SCREEN_HEIGHT or drop['y'] < 100:
-                self.oil_drops.remove(drop)
+        self.tank_level, self.oil_processed, self.oil_spilled, self.oil_n = _tick_refinery(
+            self.tank_level, self.oil_processed, self.oil_spilled, self.oil, self.oil_n,
+            bool(feed_pump_on), bool(outlet_valve_open), bool(sep_valve_open),
+            bool(waste_valve_open), self.SCREEN_HEIGHT)
         
         # Update sensor values
         tank_level_percent = int(self.tank_level)
         oil_upper_sensor = self.tank_level > 90
         
-        self.modbus_bridge.update_sensors({
+        self._write_sensors({
             'SENSOR_TANK_LEVEL': tank_level_percent,
             'SENSOR_OIL_SPILL': int(self.oil_spilled),
             'SENSOR_OIL_PROCESSED': int(self.oil_processed),
             'SENSOR_OIL_UPPER': oil_upper_sensor
         })
     
+    def _write_sensors(self, sensor_values: Dict[str, Any]):
+        """Write only the sensor values that changed since the last write"""
+        delta = {tag: value for tag, value in sensor_values.items()
+                 if tag not in self._last_sensors or self._last_sensors[tag] != value}
+        if delta:
+            self.modbus_bridge.update_sensors(delta)
+            self._last_sensors.update(delta)
+    
+    def _make_dot(self, color, radius: int) -> pygame.Surface:
+        """Render a filled circle sprite centered at (radius, radius)"""
+        surf = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.circle(surf, color, (radius, radius), radius)
+        return surf.convert_alpha()
+    
+    def _dot(self, color, radius: int, x: int, y: int):
+        """Blit sequence entry placing a circle sprite centered at (x, y)"""
+        return (self._dots[(color, radius)], (x - radius, y - radius))
+    
+    def _text(self, font, text: str, color) -> pygame.Surface:
+        """Render text, reusing the surface from an earlier identical render"""
+        key = (id(font), text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            if len(self._text_cache) >= self.TEXT_CACHE_SIZE:
+                self._text_cache.clear()
+            surface = font.render(text, True, color).convert_alpha()
+            self._text_cache[key] = surface
+        return surface
+    
     def _draw(self):
         """Draw the plant visualization"""
-        self.screen.fill(self.WHITE)
+        self.screen.blit(self._bg, (0, 0))
         
-        if self.plant_type == "bottle":
-            self._draw_bottle_plant()
-        else:
-            self._draw_refinery_plant()
+        self._draw_plant()
         
         # Draw UI elements
         self._draw_ui()
     
     def _draw_bottle_plant(self):
         """Draw bottle filling plant"""
-        # Draw base
-        pygame.draw.rect(self.screen, self.BLACK, (0, 300, self.SCREEN_WIDTH, 20))
-        
-        # Draw nozzle
-        nozzle_color = self.GREEN if self.modbus_bridge.get_tag_value('ACT_NOZZLE') else self.RED
-        pygame.draw.rect(self.screen, nozzle_color, (165, 410, 30, 40))
+        labels = []
         
-        # Draw all bottles
-        for i, bottle in enumerate(self.bottles):
-            bottle_x = bottle['position']
-            bottle_y = 300
-            
-            # Bottle outline (highlight current bottle)
-            outline_color = self.BLUE if i == self.current_bottle else self.BLACK
-            outline_width = 3 if i == self.current_bottle else 2
-            pygame.draw.rect(self.screen, outline_color, (bottle_x - 25, bottle_y - 100, 50, 100), outline_width)
-            
-            # Bottle fill level
-            fill_height = int(bottle['level'] * 80)
-            if fill_height > 0:
-                fill_color = self.GREEN if bottle['filled'] else self.BLUE
-                pygame.draw.rect(self.screen, fill_color, 
-                               (bottle_x - 23, bottle_y - 20 - fill_height, 46, fill_height))
+        # Hold one lock across the rect draws (blits need the surface unlocked)
+        self.screen.lock()
+        try:
+            # Draw nozzle
+            nozzle_color = self.GREEN if self._snapshot_value('ACT_NOZZLE') else self.RED
+            pygame.draw.rect(self.screen, nozzle_color, (165, 410, 30, 40))
             
-            # Bottle number
-            number_text = self.font_small.render(str(i+1), True, self.BLACK)
-            self.screen.blit(number_text, (bottle_x - 5, bottle_y - 120))
+            # Draw all bottles
+            for i in range(self.NUM_BOTTLES):
+                bottle_x = self.bpos[i]
+                bottle_y = 300
+                
+                # Bottle outline (highlight current bottle)
+                outline_color = self.BLUE if i == self.current_bottle else self.BLACK
+                outline_width = 3 if i == self.current_bottle else 2
+                pygame.draw.rect(self.screen, outline_color, (bottle_x - 25, bottle_y - 100, 50, 100), outline_width)
+                
+                # Bottle fill level
+                fill_height = int(self.blevel[i] * 80)
+                if fill_height > 0:
+                    fill_color = self.GREEN if self.bfilled[i] else self.BLUE
+                    pygame.draw.rect(self.screen, fill_color, 
+                                   (bottle_x - 23, bottle_y - 20 - fill_height, 46, fill_height))
+                
+                # Bottle number (sits above the bottle, so drawing it later is safe)
+                labels.append((self._text(self.font_small, str(i+1), self.BLACK), (bottle_x - 5, bottle_y - 120)))
+        finally:
+            self.screen.unlock()
         
-        # Draw limit switch
-        current_bottle = self.bottles[self.current_bottle]
-        switch_color = self.GREEN if 130 <= current_bottle['position'] <= 200 else self.RED
-        pygame.draw.circle(self.screen, switch_color, (200, 300), 5)
+        self.screen.blits(labels, doreturn=False)
         
-        # Draw level sensor
-        sensor_color = self.GREEN if current_bottle['filled'] else self.RED
-        pygame.draw.circle(self.screen, sensor_color, (155, 380), 5)
+        # Limit switch and level sensor
+        switch_color = self.GREEN if 130 <= self.bpos[self.current_bottle] <= 200 else self.RED
+        sensor_color = self.GREEN if self.bfilled[self.current_bottle] else self.RED
+        dots = [self._dot(switch_color, 5, 200, 300), self._dot(sensor_color, 5, 155, 380)]
         
-        # Draw water drops
-        for drop in self.water_drops:
-            pygame.draw.circle(self.screen, self.BLUE, (int(drop['x']), int(drop['y'])), 3)
+        # Water drops
+        dots.extend(self._dot(self.BLUE, 3, int(x), int(y)) for x, y in self.water[:self.water_n, :2])
         
-        # Draw run status indicator (large colored circle)
-        run_cmd = self.modbus_bridge.get_tag_value('CMD_RUN')
+        # Run status indicator (large colored circle)
+        run_cmd = self._snapshot_value('CMD_RUN')
         status_color = self.GREEN if run_cmd else self.RED
-        pygame.draw.circle(self.screen, status_color, (self.SCREEN_WIDTH - 30, 30), 15)
+        dots.append(self._dot(status_color, 15, self.SCREEN_WIDTH - 30, 30))
         
-        # Draw motor status indicator
-        motor_on = self.modbus_bridge.get_tag_value('ACT_MOTOR')
+        # Motor status indicator
+        motor_on = self._snapshot_value('ACT_MOTOR')
         motor_color = self.GREEN if motor_on else self.RED
-        pygame.draw.circle(self.screen, motor_color, (self.SCREEN_WIDTH - 30, 60), 10)
+        dots.append(self._dot(motor_color, 10, self.SCREEN_WIDTH - 30, 60))
         
-        # Draw nozzle status indicator
-        nozzle_open = self.modbus_bridge.get_tag_value('ACT_NOZZLE')
+        # Nozzle status indicator
+        nozzle_open = self._snapshot_value('ACT_NOZZLE')
         nozzle_color = self.GREEN if nozzle_open else self.RED
-        pygame.draw.circle(self.screen, nozzle_color, (self.SCREEN_WIDTH - 30, 90), 10)
+        dots.append(self._dot(nozzle_color, 10, self.SCREEN_WIDTH - 30, 90))
+        
+        # Draw sensors, drops and indicators in one batch
+        self.screen.blits(dots, doreturn=False)
     
     def _draw_refinery_plant(self):
         """Draw oil refinery plant"""
-        # Draw base
-        pygame.draw.rect(self.screen, self.BLACK, (0, 400, self.SCREEN_WIDTH, 20))
-        
-        # Draw oil tank
-        tank_x, tank_y = 115, 400
-        tank_width, tank_height = 100, 120
-        
-        # Tank outline
-        pygame.draw.rect(self.screen, self.BLACK, (tank_x, tank_y - tank_height, tank_width, tank_height), 2)
-        
-        # Tank fill level
-        fill_height = int((self.tank_level / 100.0) * (tank_height - 4))
-        if fill_height > 0:
-            pygame.draw.rect(self.screen, self.BROWN, 
-                           (tank_x + 2, tank_y - 2 - fill_height, tank_width - 4, fill_height))
-        
-        # Draw separator vessel
-        sep_x, sep_y = 327, 218
-        pygame.draw.rect(self.screen, self.DARK_GRAY, (sep_x - 15, sep_y - 10, 30, 20))
-        
-        # Draw outlet valve
-        valve_color = self.GREEN if self.modbus_bridge.get_tag_value('ACT_OUTLET_VALVE') else self.RED
-        pygame.draw.rect(self.screen, valve_color, (70 - 14, 410 - 2, 28, 4))
-        
-        # Draw separator valve
-        sep_valve_color = self.GREEN if self.modbus_bridge.get_tag_value('ACT_SEP_VALVE') else self.RED
-        pygame.draw.rect(self.screen, sep_valve_color, (sep_x - 15, sep_y - 2, 30, 4))
-        
-        # Draw waste valve
-        waste_valve_color = self.GREEN if self.modbus_bridge.get_tag_value('ACT_WASTE_VALVE') else self.RED
-        pygame.draw.rect(self.screen, waste_valve_color, (225 - 8, 218 - 2, 16, 4))
+        # Hold one lock across the rect draws (blits need the surface unlocked)
+        self.screen.lock()
+        try:
+            # Draw oil tank
+            tank_x, tank_y = 115, 400
+            tank_width, tank_height = 100, 120
+            
+            # Tank outline
+            pygame.draw.rect(self.screen, self.BLACK, (tank_x, tank_y - tank_height, tank_width, tank_height), 2)
+            
+            # Tank fill level
+            fill_height = int((self.tank_level / 100.0) * (tank_height - 4))
+            if fill_height > 0:
+                pygame.draw.rect(self.screen, self.BROWN, 
+                               (tank_x + 2, tank_y - 2 - fill_height, tank_width - 4, fill_height))
+            
+            # Draw separator vessel
+            sep_x, sep_y = 327, 218
+            pygame.draw.rect(self.screen, self.DARK_GRAY, (sep_x - 15, sep_y - 10, 30, 20))
+            
+            # Draw outlet valve
+            valve_color = self.GREEN if self._snapshot_value('ACT_OUTLET_VALVE') else self.RED
+            pygame.draw.rect(self.screen, valve_color, (70 - 14, 410 - 2, 28, 4))
+            
+            # Draw separator valve
+            sep_valve_color = self.GREEN if self._snapshot_value('ACT_SEP_VALVE') else self.RED
+            pygame.draw.rect(self.screen, sep_valve_color, (sep_x - 15, sep_y - 2, 30, 4))
+            
+            # Draw waste valve
+            waste_valve_color = self.GREEN if self._snapshot_value('ACT_WASTE_VALVE') else self.RED
+            pygame.draw.rect(self.screen, waste_valve_color, (225 - 8, 218 - 2, 16, 4))
+        finally:
+            self.screen.unlock()
         
         # Draw oil drops
-        for drop in self.oil_drops:
-            pygame.draw.circle(self.screen, self.BROWN, (int(drop['x']), int(drop['y'])), 2)
+        self.screen.blits([self._dot(self.BROWN, 2, int(x), int(y))
+                           for x, y in self.oil[:self.oil_n, :2]], doreturn=False)
         
         # Draw spill sensor
         spill_x, spill_y = 0, 100
@@ -350,91 +543,78 @@ class PygameFrontend:
     
     def _draw_ui(self):
         """Draw UI elements"""
-        # Clear UI area with white background
-        pygame.draw.rect(self.screen, self.WHITE, (0, 0, 300, self.SCREEN_HEIGHT))
-        
-        # Title
-        title = self.font_medium.render(f"{self.plant_type.title()} Plant", True, self.BLACK)
-        self.screen.blit(title, (10, 40))
-        
-        # VirtuaPlant branding
-        name = self.font_big.render("VirtuaPlant", True, self.DARK_GRAY)
-        self.screen.blit(name, (10, 10))
+        # Clear UI area and draw the title and branding
+        self.screen.blit(self._ui_bg, (0, 0))
         
         # Instructions
-        instructions = self.font_small.render("ESC=quit, SPACE=run, N=nozzle, M=motor, TAB=bottle", True, self.GRAY)
-        self.screen.blit(instructions, (self.SCREEN_WIDTH - 350, 10))
+        self.screen.blit(self._instructions_surf, (self.SCREEN_WIDTH - 350, 10))
         
         # Status information
-        if self.plant_type == "bottle":
-            self._draw_bottle_status()
-        else:
-            self._draw_refinery_status()
+        self._draw_status()
     
     def _draw_bottle_status(self):
         """Draw bottle plant status"""
         y_offset = 70
         
         # Run command status (most important) - LARGE TEXT
-        run_cmd = self.modbus_bridge.get_tag_value('CMD_RUN')
+        run_cmd = self._snapshot_value('CMD_RUN')
         run_color = self.GREEN if run_cmd else self.RED
-        run_text = self.font_big.render(f"RUN: {'ON' if run_cmd else 'OFF'}", True, run_color)
+        run_text = self._text(self.font_big, f"RUN: {'ON' if run_cmd else 'OFF'}", run_color)
         self.screen.blit(run_text, (10, y_offset))
         
         # Current bottle info - LARGE TEXT
-        current_bottle = self.bottles[self.current_bottle]
-        pos_text = self.font_medium.render(f"Bottle {self.current_bottle+1} Pos: {current_bottle['position']:.1f}", True, self.BLACK)
+        pos_text = self._text(self.font_medium, f"Bottle {self.current_bottle+1} Pos: {self.bpos[self.current_bottle]:.1f}", self.BLACK)
         self.screen.blit(pos_text, (10, y_offset + 40))
         
         # Bottle level - LARGE TEXT
-        level_text = self.font_medium.render(f"Bottle {self.current_bottle+1} Level: {current_bottle['level']:.2f}", True, self.BLACK)
+        level_text = self._text(self.font_medium, f"Bottle {self.current_bottle+1} Level: {self.blevel[self.current_bottle]:.2f}", self.BLACK)
         self.screen.blit(level_text, (10, y_offset + 70))
         
         # Bottle status
-        status_color = self.GREEN if current_bottle['filled'] else self.RED
-        status_text = self.font_medium.render(f"Bottle {self.current_bottle+1}: {'FILLED' if current_bottle['filled'] else 'EMPTY'}", True, status_color)
+        filled = self.bfilled[self.current_bottle]
+        status_color = self.GREEN if filled else self.RED
+        status_text = self._text(self.font_medium, f"Bottle {self.current_bottle+1}: {'FILLED' if filled else 'EMPTY'}", status_color)
         self.screen.blit(status_text, (10, y_offset + 100))
         
         # Motor status - LARGE TEXT
-        motor_on = self.modbus_bridge.get_tag_value('ACT_MOTOR')
+        motor_on = self._snapshot_value('ACT_MOTOR')
         motor_color = self.GREEN if motor_on else self.RED
-        motor_text = self.font_medium.render(f"MOTOR: {'ON' if motor_on else 'OFF'}", True, motor_color)
-        self.screen.blit(motor_text, (10, y_offset + 100))
+        motor_text = self._text(self.font_medium, f"MOTOR: {'ON' if motor_on else 'OFF'}", motor_color)
+        self.screen.blit(motor_text, (10, y_offset + 130))
         
         # Nozzle status - LARGE TEXT
-        nozzle_open = self.modbus_bridge.get_tag_value('ACT_NOZZLE')
+        nozzle_open = self._snapshot_value('ACT_NOZZLE')
         nozzle_color = self.GREEN if nozzle_open else self.RED
-        nozzle_text = self.font_medium.render(f"NOZZLE: {'OPEN' if nozzle_open else 'CLOSED'}", True, nozzle_color)
-        self.screen.blit(nozzle_text, (10, y_offset + 130))
+        nozzle_text = self._text(self.font_medium, f"NOZZLE: {'OPEN' if nozzle_open else 'CLOSED'}", nozzle_color)
+        self.screen.blit(nozzle_text, (10, y_offset + 160))
         
         # Add a flashing indicator when run is active
         if run_cmd:
-            import time
             flash = int(time.time() * 2) % 2  # Flash every 0.5 seconds
             if flash:
-                flash_text = self.font_big.render("*** RUNNING ***", True, self.GREEN)
-                self.screen.blit(flash_text, (10, y_offset + 160))
+                flash_text = self._text(self.font_big, "*** RUNNING ***", self.GREEN)
+                self.screen.blit(flash_text, (10, y_offset + 190))
     
     def _draw_refinery_status(self):
         """Draw refinery plant status"""
         y_offset = 70
         
         # Tank level
-        level_text = self.font_small.render(f"Tank Level: {self.tank_level:.1f}%", True, self.BLACK)
+        level_text = self._text(self.font_small, f"Tank Level: {self.tank_level:.1f}%", self.BLACK)
         self.screen.blit(level_text, (10, y_offset))
         
         # Oil processed
-        processed_text = self.font_small.render(f"Processed: {self.oil_processed:.1f}L", True, self.BLACK)
+        processed_text = self._text(self.font_small, f"Processed: {self.oil_processed:.1f}L", self.BLACK)
         self.screen.blit(processed_text, (10, y_offset + 20))
         
         # Oil spilled
-        spilled_text = self.font_small.render(f"Spilled: {self.oil_spilled:.1f}L", True, self.RED)
+        spilled_text = self._text(self.font_small, f"Spilled: {self.oil_spilled:.1f}L", self.RED)
         self.screen.blit(spilled_text, (10, y_offset + 40))
         
         # Feed pump status
-        pump_on = self.modbus_bridge.get_tag_value('ACT_FEED_PUMP')
+        pump_on = self._snapshot_value('ACT_FEED_PUMP')
         pump_color = self.GREEN if pump_on else self.RED
-        pump_text = self.font_small.render(f"Feed Pump: {'ON' if pump_on else 'OFF'}", True, pump_color)
+        pump_text = self._text(self.font_small, f"Feed Pump: {'ON' if pump_on else 'OFF'}", pump_color)
         self.screen.blit(pump_text, (10, y_offset + 60))
     
     def _toggle_run(self):
@@ -443,16 +623,19 @@ class PygameFrontend:
             current_run = self.modbus_bridge.get_tag_value('CMD_RUN')
             new_run = not current_run
             self.modbus_bridge.set_tag_value('CMD_RUN', new_run)
-            print(f"Run command toggled: {current_run} -> {new_run}")
+            if self.debug:
+                print(f"Run command toggled: {current_run} -> {new_run}")
             
             # Also toggle motor automatically for better visual feedback
             if new_run:
                 self.modbus_bridge.set_tag_value('ACT_MOTOR', True)
-                print("Motor automatically turned ON")
+                if self.debug:
+                    print("Motor automatically turned ON")
             else:
                 self.modbus_bridge.set_tag_value('ACT_MOTOR', False)
                 self.modbus_bridge.set_tag_value('ACT_NOZZLE', False)
-                print("Motor and nozzle automatically turned OFF")
+                if self.debug:
+                    print("Motor and nozzle automatically turned OFF")
                 
         except Exception as e:
             print(f"Error toggling run command: {e}")
@@ -463,7 +646,8 @@ class PygameFrontend:
             current_nozzle = self.modbus_bridge.get_tag_value('ACT_NOZZLE')
             new_nozzle = not current_nozzle
             self.modbus_bridge.set_tag_value('ACT_NOZZLE', new_nozzle)
-            print(f"Nozzle toggled: {current_nozzle} -> {new_nozzle}")
+            if self.debug:
+                print(f"Nozzle toggled: {current_nozzle} -> {new_nozzle}")
         except Exception as e:
             print(f"Error toggling nozzle: {e}")
     
@@ -473,14 +657,16 @@ class PygameFrontend:
             current_motor = self.modbus_bridge.get_tag_value('ACT_MOTOR')
             new_motor = not current_motor
             self.modbus_bridge.set_tag_value('ACT_MOTOR', new_motor)
-            print(f"Motor toggled: {current_motor} -> {new_motor}")
+            if self.debug:
+                print(f"Motor toggled: {current_motor} -> {new_motor}")
         except Exception as e:
             print(f"Error toggling motor: {e}")
     
     def _switch_bottle(self):
         """Switch to next bottle"""
-        self.current_bottle = (self.current_bottle + 1) % len(self.bottles)
-        print(f"Switched to bottle {self.current_bottle + 1}")
+        self.current_bottle = (self.current_bottle + 1) % self.NUM_BOTTLES
+        if self.debug:
+            print(f"Switched to bottle {self.current_bottle + 1}")
 
 def main():
     """Main entry point"""
@@ -489,10 +675,11 @@ def main():
     parser = argparse.ArgumentParser(description="VirtuaPlant Pygame Frontend")
     parser.add_argument("plant", choices=["bottle", "refinery"], help="Plant type to visualize")
     parser.add_argument("--port", type=int, default=5020, help="Modbus port")
+    parser.add_argument("--debug", action="store_true", help="Print key and toggle events")
     
     args = parser.parse_args()
     
-    frontend = PygameFrontend(args.plant, args.port)
+    frontend = PygameFrontend(args.plant, args.port, debug=args.debug)
     frontend.start()
 
 if __name__ == "__main__":
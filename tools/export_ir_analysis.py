@@ -8,15 +8,19 @@ import subprocess
 import sys
 import json
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Absolute virtuaplant checkout that CrossPLC reads from and writes to
+VIRTUAPLANT_DIR = "/Users/lag/Development/virtuaplant"
+
 def run_crossplc_analysis(st_file: str, output_file: str, components: str = "tags,control_flow"):
     """Run CrossPLC analysis on OpenPLC ST file"""
     
     # Use absolute paths from virtuaplant directory
-    virtuaplant_dir = "/Users/lag/Development/virtuaplant"
-    st_file_abs = str(Path(virtuaplant_dir) / st_file)
-    output_file_abs = str(Path(virtuaplant_dir) / output_file)
+    st_file_abs = str(Path(VIRTUAPLANT_DIR) / st_file)
+    output_file_abs = str(Path(VIRTUAPLANT_DIR) / output_file)
     
     cmd = [
         "python3", "-m", "crossplc.cli", "analyze-multi",
@@ -27,7 +31,8 @@ def run_crossplc_analysis(st_file: str, output_file: str, components: str = "tag
     ]
     
     print(f"Running: {' '.join(cmd)}")
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    # Only stderr is reported, so discard stdout instead of buffering it
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
     
     if result.returncode != 0:
         print(f"Error running CrossPLC analysis: {result.stderr}")
@@ -62,32 +67,22 @@ def main():
     original_cwd = Path.cwd()
     os.chdir(crossplc_dir)
     
-    for plant in plants:
-        print(f"\n=== Processing {plant['name']} plant ===")
-        
-        # Export semantic analysis
-        print(f"Exporting semantic analysis...")
-        success = run_crossplc_analysis(
-            plant['st_file'],
-            plant['semantic_output'],
-            "tags,control_flow"
-        )
-        
+    # The semantic and CFG exports use the same components, so run CrossPLC
+    # once per plant (plants in parallel) and copy the result
+    print(f"\n=== Exporting {len(plants)} plants in parallel ===")
+    with ThreadPoolExecutor(max_workers=len(plants)) as executor:
+        results = list(executor.map(
+            lambda plant: run_crossplc_analysis(plant['st_file'], plant['semantic_output'], "tags,control_flow"),
+            plants))
+    
+    for plant, success in zip(plants, results):
         if not success:
             print(f"Failed to export semantic analysis for {plant['name']}")
             continue
         
-        # Export CFG analysis with graphs
-        print(f"Exporting CFG analysis...")
-        success = run_crossplc_analysis(
-            plant['st_file'],
-            plant['cfg_output'],
-            "tags,control_flow"
-        )
-        
-        if not success:
-            print(f"Failed to export CFG analysis for {plant['name']}")
-            continue
+        shutil.copyfile(Path(VIRTUAPLANT_DIR) / plant['semantic_output'],
+                        Path(VIRTUAPLANT_DIR) / plant['cfg_output'])
+        print(f"Copied CFG analysis to {plant['cfg_output']}")
     
     # Change back to original directory
     os.chdir(original_cwd)
@@ -4,228 +4,277 @@ Graph Exporter for VirtuaPlant
 Generates DOT and GraphML files from CrossPLC IR analysis
 """
 
+import io
+import itertools
 import json
 import os
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, Any, List
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# GraphML namespaces and qualified tag names
+GRAPHML_NS = "http://graphml.graphdrawing.org/xmlns"
+XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+ET.register_namespace("", GRAPHML_NS)
+ET.register_namespace("xsi", XSI_NS)
+
+GRAPHML_TAG = f"{{{GRAPHML_NS}}}graphml"
+KEY_TAG = f"{{{GRAPHML_NS}}}key"
+GRAPH_TAG = f"{{{GRAPHML_NS}}}graph"
+NODE_TAG = f"{{{GRAPHML_NS}}}node"
+EDGE_TAG = f"{{{GRAPHML_NS}}}edge"
+DATA_TAG = f"{{{GRAPHML_NS}}}data"
+XSI_SCHEMA_LOCATION = f"{{{XSI_NS}}}schemaLocation"
+GRAPHML_SCHEMA_LOCATION = f"{GRAPHML_NS} http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd"
+
+# Shared <data> attribute dicts (ElementTree copies attrib on construction)
+TYPE_DATA = {"key": "type"}
+ROUTINE_DATA = {"key": "routine"}
+DEFS_DATA = {"key": "defs"}
+USES_DATA = {"key": "uses"}
+SHARED_TAGS_DATA = {"key": "shared_tags"}
+
+# DOT line templates, bound once at import time
+_CFG_NODE_TMPL = '  "{}_{}" [label="{}"];\n'.format
+_CFG_EDGE_TMPL = '  "{0}_{1}" -> "{0}_{2}";\n'.format
+_FLOW_NODE_TMPL = '  "{0}" [fillcolor=lightgreen, label="{0}"];\n'.format
+_FLOW_EDGE_TMPL = '  "{}" -> "{}" [label="{}"];\n'.format
+
+# Dataflow edge fields, falling back to .get defaults when a key is missing
+_EDGE_FIELDS = itemgetter('source_routine', 'target_routine', 'shared_tags')
+
+# Quoted DOT strings need quotes and backslashes escaped; real newlines become line breaks
+_DOT_ESCAPE = str.maketrans({'"': '\\"', '\\': '\\\\', '\n': '\\n'})
+
+def _cfg_dot_rows(cfg_data: Dict[str, Any]) -> List[tuple]:
+    """Flatten CFG blocks into escaped (routine, block_id, label, targets) rows"""
+    
+    rows = []
+    for routine_name, routine_cfg in cfg_data.items():
+        blocks = routine_cfg.get('blocks')
+        if blocks is None:
+            continue
+        
+        # IR ids need not be strings; coerce them as the f-string writer did
+        routine_name = str(routine_name)
+        routine_id = routine_name.translate(_DOT_ESCAPE)
+        block_ids = [str(block.get('block_id', f"block_{i}")) for i, block in enumerate(blocks)]
+        escaped_ids = [block_id.translate(_DOT_ESCAPE) for block_id in block_ids]
+        for i, block in enumerate(blocks):
+            block_get = block.get
+            
+            # Create node label, adding defs and uses when present
+            parts = [routine_name, block_ids[i], f"({block_get('type', 'instruction')})"]
+            defs = block_get('defs', [])
+            uses = block_get('uses', [])
+            if defs:
+                parts.append("Defs: " + ", ".join(defs))
+            if uses:
+                parts.append("Uses: " + ", ".join(uses))
+            
+            # Edge to next block, then conditional edges if specified
+            targets = [escaped_ids[i + 1]] if i + 1 < len(blocks) else []
+            successors = block_get('successors')
+            if successors:
+                targets.extend([str(successor).translate(_DOT_ESCAPE) for successor in successors])
+            
+            # Join on real newlines so a single translate escapes and breaks the label
+            rows.append((routine_id, escaped_ids[i], "\n".join(parts).translate(_DOT_ESCAPE), targets))
+    
+    return rows
+
+def _emit_cfg_dot(rows: List[tuple], fout):
+    """Write CFG node lines followed by edge lines"""
+    
+    write = fout.write
+    node_fmt = _CFG_NODE_TMPL
+    edge_fmt = _CFG_EDGE_TMPL
+    for routine_id, block_id, label, _ in rows:
+        write(node_fmt(routine_id, block_id, label))
+    write("\n")
+    writelines = fout.writelines
+    for routine_id, block_id, _, targets in rows:
+        writelines([edge_fmt(routine_id, block_id, target) for target in targets])
+
 def export_cfg_to_dot(cfg_data: Dict[str, Any], output_file: str):
     """Export control flow graph to DOT format"""
     
-    dot_content = []
-    dot_content.append("digraph CFG {")
-    dot_content.append("  rankdir=TB;")
-    dot_content.append("  node [shape=box, style=filled, fillcolor=lightblue];")
-    dot_content.append("  edge [color=black];")
-    dot_content.append("")
-    
-    # Add nodes
-    for routine_name, routine_cfg in cfg_data.items():
-        if 'blocks' in routine_cfg:
-            for i, block in enumerate(routine_cfg['blocks']):
-                block_id = block.get('block_id', f"block_{i}")
-                block_type = block.get('type', 'instruction')
-                
-                # Create node label
-                label = f"{routine_name}\\n{block_id}\\n({block_type})"
-                
-                # Add defs and uses to label
-                defs = block.get('defs', [])
-                uses = block.get('uses', [])
-                if defs:
-                    label += f"\\nDefs: {', '.join(defs)}"
-                if uses:
-                    label += f"\\nUses: {', '.join(uses)}"
-                
-                dot_content.append(f'  "{routine_name}_{block_id}" [label="{label}"];')
-    
-    dot_content.append("")
+    rows = _cfg_dot_rows(cfg_data)
     
-    # Add edges
-    for routine_name, routine_cfg in cfg_data.items():
-        if 'blocks' in routine_cfg:
-            blocks = routine_cfg['blocks']
-            for i, block in enumerate(blocks):
-                current_id = block.get('block_id', f"block_{i}")
-                
-                # Add edge to next block
-                if i + 1 < len(blocks):
-                    next_block = blocks[i + 1]
-                    next_id = next_block.get('block_id', f"block_{i+1}")
-                    dot_content.append(f'  "{routine_name}_{current_id}" -> "{routine_name}_{next_id}";')
-                
-                # Add conditional edges if specified
-                if 'successors' in block:
-                    for successor in block['successors']:
-                        dot_content.append(f'  "{routine_name}_{current_id}" -> "{routine_name}_{successor}";')
-    
-    dot_content.append("}")
-    
-    # Write DOT file
-    with open(output_file, 'w') as f:
-        f.write('\n'.join(dot_content))
+    # Stream the DOT file line by line
+    with open(output_file, 'w', buffering=1 << 20) as f:
+        write = f.write
+        write("digraph CFG {\n")
+        write("  rankdir=TB;\n")
+        write("  node [shape=box, style=filled, fillcolor=lightblue];\n")
+        write("  edge [color=black];\n")
+        write("\n")
+        _emit_cfg_dot(rows, f)
+        write("}")
     
     print(f"✅ DOT file exported: {output_file}")
 
 def export_dataflow_to_dot(dataflow_data: Dict[str, Any], output_file: str):
     """Export data flow graph to DOT format"""
     
-    dot_content = []
-    dot_content.append("digraph DataFlow {")
-    dot_content.append("  rankdir=LR;")
-    dot_content.append("  node [shape=ellipse, style=filled];")
-    dot_content.append("  edge [color=blue];")
-    dot_content.append("")
-    
-    # Add nodes for routines
-    routines = set()
-    for edge in dataflow_data:
-        routines.add(edge.get('source_routine', 'unknown'))
-        routines.add(edge.get('target_routine', 'unknown'))
-    
-    for routine in routines:
-        dot_content.append(f'  "{routine}" [fillcolor=lightgreen, label="{routine}"];')
-    
-    dot_content.append("")
-    
-    # Add edges for data flow
-    for edge in dataflow_data:
-        source = edge.get('source_routine', 'unknown')
-        target = edge.get('target_routine', 'unknown')
-        shared_tags = edge.get('shared_tags', [])
+    # Collect routines for the node list
+    routines = set(itertools.chain.from_iterable(
+        (edge.get('source_routine', 'unknown'), edge.get('target_routine', 'unknown'))
+        for edge in dataflow_data
+    ))
+    
+    node_fmt = _FLOW_NODE_TMPL
+    edge_fmt = _FLOW_EDGE_TMPL
+    
+    # Stream the DOT file line by line
+    with open(output_file, 'w', buffering=1 << 20) as f:
+        write = f.write
+        write("digraph DataFlow {\n")
+        write("  rankdir=LR;\n")
+        write("  node [shape=ellipse, style=filled];\n")
+        write("  edge [color=blue];\n")
+        write("\n")
         
-        if shared_tags:
-            label = f"\\n{', '.join(shared_tags[:3])}"  # Show first 3 tags
-            if len(shared_tags) > 3:
-                label += "..."
-        else:
-            label = ""
+        # Add nodes for routines, sorted so output is stable across runs
+        for routine in sorted(routines, key=str):
+            write(node_fmt(str(routine).translate(_DOT_ESCAPE)))
         
-        dot_content.append(f'  "{source}" -> "{target}" [label="{label}"];')
-    
-    dot_content.append("}")
-    
-    # Write DOT file
-    with open(output_file, 'w') as f:
-        f.write('\n'.join(dot_content))
+        write("\n")
+        
+        # Add edges for data flow
+        for edge in dataflow_data:
+            try:
+                source, target, shared_tags = _EDGE_FIELDS(edge)
+            except KeyError:
+                source = edge.get('source_routine', 'unknown')
+                target = edge.get('target_routine', 'unknown')
+                shared_tags = edge.get('shared_tags')
+            shared_tags = shared_tags or ()
+            
+            # Show first 3 tags
+            tag_count = len(shared_tags)
+            if tag_count:
+                label = ("\n" + ", ".join(shared_tags[:3]) + ("..." if tag_count > 3 else "")).translate(_DOT_ESCAPE)
+            else:
+                label = ""
+            
+            write(edge_fmt(str(source).translate(_DOT_ESCAPE), str(target).translate(_DOT_ESCAPE), label))
+        
+        write("}")
     
     print(f"✅ Data flow DOT file exported: {output_file}")
 
 def export_to_graphml(cfg_data: Dict[str, Any], dataflow_data: Dict[str, Any], output_file: str):
     """Export to GraphML format"""
     
-    graphml_content = []
-    graphml_content.append('<?xml version="1.0" encoding="UTF-8"?>')
-    graphml_content.append('<graphml xmlns="http://graphml.graphdrawing.org/xmlns"')
-    graphml_content.append('         xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"')
-    graphml_content.append('         xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns')
-    graphml_content.append('         http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">')
-    graphml_content.append('')
+    root = ET.Element(GRAPHML_TAG, {XSI_SCHEMA_LOCATION: GRAPHML_SCHEMA_LOCATION})
     
     # Define attributes
-    graphml_content.append('  <key id="type" for="node" attr.name="type" attr.type="string"/>')
-    graphml_content.append('  <key id="routine" for="node" attr.name="routine" attr.type="string"/>')
-    graphml_content.append('  <key id="defs" for="node" attr.name="defs" attr.type="string"/>')
-    graphml_content.append('  <key id="uses" for="node" attr.name="uses" attr.type="string"/>')
-    graphml_content.append('  <key id="shared_tags" for="edge" attr.name="shared_tags" attr.type="string"/>')
-    graphml_content.append('')
+    for key_id, key_for in (("type", "node"), ("routine", "node"), ("defs", "node"),
+                            ("uses", "node"), ("shared_tags", "edge")):
+        ET.SubElement(root, KEY_TAG, {"id": key_id, "for": key_for,
+                                      "attr.name": key_id, "attr.type": "string"})
     
     # Start graph
-    graphml_content.append('  <graph id="virtuaplant_cfg" edgedefault="directed">')
+    graph = ET.SubElement(root, GRAPH_TAG, {"id": "virtuaplant_cfg", "edgedefault": "directed"})
+    
+    sub_element = ET.SubElement
     
-    # Add nodes
-    node_id = 0
-    node_map = {}
+    # ElementTree only serializes str text, so IR values are coerced as the templates did
+    def add_node(node_id, node_type, routine, defs, uses):
+        node = sub_element(graph, NODE_TAG, {"id": f"n{node_id}"})
+        sub_element(node, DATA_TAG, TYPE_DATA).text = str(node_type)
+        sub_element(node, DATA_TAG, ROUTINE_DATA).text = str(routine)
+        sub_element(node, DATA_TAG, DEFS_DATA).text = defs
+        sub_element(node, DATA_TAG, USES_DATA).text = uses
     
+    # Add nodes in a single pass, remembering node names and sequential edges
+    node_names = []
+    sequential = []
     for routine_name, routine_cfg in cfg_data.items():
-        if 'blocks' in routine_cfg:
-            for i, block in enumerate(routine_cfg['blocks']):
-                block_id = block.get('block_id', f"block_{i}")
-                block_type = block.get('type', 'instruction')
-                defs = block.get('defs', [])
-                uses = block.get('uses', [])
-                
-                graphml_content.append(f'    <node id="n{node_id}">')
-                graphml_content.append(f'      <data key="type">{block_type}</data>')
-                graphml_content.append(f'      <data key="routine">{routine_name}</data>')
-                graphml_content.append(f'      <data key="defs">{",".join(defs)}</data>')
-                graphml_content.append(f'      <data key="uses">{",".join(uses)}</data>')
-                graphml_content.append(f'    </node>')
-                
-                node_map[f"{routine_name}_{block_id}"] = node_id
-                node_id += 1
+        blocks = routine_cfg.get('blocks')
+        if blocks is None:
+            continue
+        
+        previous_node = None
+        for i, block in enumerate(blocks):
+            block_get = block.get
+            current_node = f"{routine_name}_{block_get('block_id', f'block_{i}')}"
+            
+            add_node(len(node_names), block_get('type', 'instruction'), routine_name,
+                     ",".join(block_get('defs', [])), ",".join(block_get('uses', [])))
+            node_names.append(current_node)
+            
+            if previous_node is not None:
+                sequential.append((previous_node, current_node))
+            previous_node = current_node
+    
+    # Node ids by name (a repeated block id maps to its last node)
+    node_map = {name: index for index, name in enumerate(node_names)}
     
     # Add edges
     edge_id = 0
     
-    for routine_name, routine_cfg in cfg_data.items():
-        if 'blocks' in routine_cfg:
-            blocks = routine_cfg['blocks']
-            for i, block in enumerate(blocks):
-                current_id = block.get('block_id', f"block_{i}")
-                current_node = f"{routine_name}_{current_id}"
-                
-                if current_node in node_map:
-                    source_id = node_map[current_node]
-                    
-                    # Add edge to next block
-                    if i + 1 < len(blocks):
-                        next_block = blocks[i + 1]
-                        next_id = next_block.get('block_id', f"block_{i+1}")
-                        next_node = f"{routine_name}_{next_id}"
-                        
-                        if next_node in node_map:
-                            target_id = node_map[next_node]
-                            graphml_content.append(f'    <edge id="e{edge_id}" source="n{source_id}" target="n{target_id}"/>')
-                            edge_id += 1
-    
-    # Add data flow edges
-    for edge in dataflow_data:
-        source = edge.get('source_routine', 'unknown')
-        target = edge.get('target_routine', 'unknown')
-        shared_tags = edge.get('shared_tags', [])
-        
-        # Find or create nodes for routines
-        if source not in node_map:
-            graphml_content.append(f'    <node id="n{node_id}">')
-            graphml_content.append(f'      <data key="type">routine</data>')
-            graphml_content.append(f'      <data key="routine">{source}</data>')
-            graphml_content.append(f'      <data key="defs"></data>')
-            graphml_content.append(f'      <data key="uses"></data>')
-            graphml_content.append(f'    </node>')
-            node_map[source] = node_id
-            node_id += 1
-        
-        if target not in node_map:
-            graphml_content.append(f'    <node id="n{node_id}">')
-            graphml_content.append(f'      <data key="type">routine</data>')
-            graphml_content.append(f'      <data key="routine">{target}</data>')
-            graphml_content.append(f'      <data key="defs"></data>')
-            graphml_content.append(f'      <data key="uses"></data>')
-            graphml_content.append(f'    </node>')
-            node_map[target] = node_id
-            node_id += 1
-        
-        source_id = node_map[source]
-        target_id = node_map[target]
-        
-        graphml_content.append(f'    <edge id="e{edge_id}" source="n{source_id}" target="n{target_id}">')
-        graphml_content.append(f'      <data key="shared_tags">{",".join(shared_tags)}</data>')
-        graphml_content.append(f'    </edge>')
-        edge_id += 1
-    
-    # Close graph and graphml
-    graphml_content.append('  </graph>')
-    graphml_content.append('</graphml>')
+    for current_node, next_node in sequential:
+        source_id = node_map.get(current_node)
+        target_id = node_map.get(next_node)
+        if source_id is not None and target_id is not None:
+            sub_element(graph, EDGE_TAG, {"id": f"e{edge_id}", "source": f"n{source_id}",
+                                          "target": f"n{target_id}"})
+            edge_id += 1
+    
+    # Add data flow edges, skipping routine-node synthesis when there are none
+    if dataflow_data:
+        node_id = len(node_names)
+        for edge in dataflow_data:
+            try:
+                source, target, shared_tags = _EDGE_FIELDS(edge)
+            except KeyError:
+                source = edge.get('source_routine', 'unknown')
+                target = edge.get('target_routine', 'unknown')
+                shared_tags = edge.get('shared_tags', [])
+            
+            # Find or create nodes for routines
+            source_id = node_map.get(source)
+            if source_id is None:
+                add_node(node_id, "routine", source, "", "")
+                source_id = node_map[source] = node_id
+                node_id += 1
+            
+            target_id = node_map.get(target)
+            if target_id is None:
+                add_node(node_id, "routine", target, "", "")
+                target_id = node_map[target] = node_id
+                node_id += 1
+            
+            graph_edge = sub_element(graph, EDGE_TAG, {"id": f"e{edge_id}", "source": f"n{source_id}",
+                                                       "target": f"n{target_id}"})
+            sub_element(graph_edge, DATA_TAG, SHARED_TAGS_DATA).text = ",".join(shared_tags)
+            edge_id += 1
     
-    # Write GraphML file
-    with open(output_file, 'w') as f:
-        f.write('\n'.join(graphml_content))
+    # Write indented GraphML (the C serializer escapes names and tags)
+    ET.indent(root, space="  ")
+    ET.ElementTree(root).write(output_file, encoding="UTF-8", xml_declaration=True)
     
     print(f"✅ GraphML file exported: {output_file}")
 
-def export_ir_graphs(plant_type: str):
-    """Export IR graphs for a specific plant"""
+def load_ir(ir_file: str) -> Dict[str, Any]:
+    """Parse an IR JSON file (orjson when available)"""
+    data = Path(ir_file).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def export_ir_graphs(plant_type: str, graphs_dir: Path):
+    """Export IR graphs for a specific plant into an existing graphs directory"""
     
     # Load IR data
     ir_file = f"ir/{plant_type}_crossplc.json"
@@ -233,23 +282,18 @@ def export_ir_graphs(plant_type: str):
         print(f"❌ IR file not found: {ir_file}")
         return
     
-    with open(ir_file, 'r') as f:
-        ir_data = json.load(f)
-    
-    # Create graphs directory
-    graphs_dir = Path("ir/graphs")
-    graphs_dir.mkdir(exist_ok=True)
+    ir_data = load_ir(ir_file)
     
     # Extract CFG data
-    cfg_data = {}
+    cfg_data = {
+        f"{plc_name}_{routine_name}": routine_data['Main']
+        for plc_name, plc_data in ir_data.get('detailed_components', {}).items()
+        if 'control_flow' in plc_data
+        for routine_name, routine_data in plc_data['control_flow'].get('routines', {}).items()
+        if 'Main' in routine_data
+    }
     dataflow_data = []
     
-    for plc_name, plc_data in ir_data.get('detailed_components', {}).items():
-        if 'control_flow' in plc_data:
-            for routine_name, routine_data in plc_data['control_flow'].get('routines', {}).items():
-                if 'Main' in routine_data:
-                    cfg_data[f"{plc_name}_{routine_name}"] = routine_data['Main']
-    
     # Generate simplified CFG if no detailed data
     if not cfg_data:
         print(f"⚠️ No detailed CFG data found, generating simplified graph for {plant_type}")
@@ -277,15 +321,29 @@ def export_ir_graphs(plant_type: str):
     
     print(f"✅ Graph exports completed for {plant_type} plant")
 
+def export_plant_logged(plant_type: str, graphs_dir: Path) -> str:
+    """Export IR graphs for one plant, returning its console output"""
+    
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        print(f"\n=== Processing {plant_type} plant ===")
+        export_ir_graphs(plant_type, graphs_dir)
+    return buffer.getvalue()
+
 def main():
     """Main function to export graphs for both plants"""
     
     print("📊 Exporting IR graphs...")
     
-    # Export for both plants
-    for plant_type in ["bottle", "refinery"]:
-        print(f"\n=== Processing {plant_type} plant ===")
-        export_ir_graphs(plant_type)
+    # Create graphs directory once for all plants
+    graphs_dir = Path("ir/graphs")
+    graphs_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Export both plants in parallel, printing each plant's log in order
+    plant_types = ["bottle", "refinery"]
+    with ProcessPoolExecutor(max_workers=len(plant_types)) as executor:
+        for log in executor.map(export_plant_logged, plant_types, itertools.repeat(graphs_dir)):
+            print(log, end="")
     
     print(f"\n🎉 Graph export complete!")
     print(f"Generated files in ir/graphs/:")
@@ -7,11 +7,23 @@ Analyzes existing Python plants to extract sensor/actuator information
 import re
 import json
 import csv
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, Iterator, List, Set, Tuple
 
+# Column order of reports/taglist.csv
+TAGLIST_COLUMNS = ("name", "type", "address", "role", "plant", "description")
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@lru_cache(maxsize=1)
 def analyze_bottle_filling_plant() -> Dict:
-    """Analyze bottle filling plant from world.py"""
+    """Analyze bottle filling plant from world.py (cached; treat as read-only)"""
     
     # Based on analysis of plants/bottle-filling/world.py
     inventory = {
@@ -68,8 +80,9 @@ def analyze_bottle_filling_plant() -> Dict:
     
     return inventory
 
+@lru_cache(maxsize=1)
 def analyze_oil_refinery_plant() -> Dict:
-    """Analyze oil refinery plant from oil_world.py"""
+    """Analyze oil refinery plant from oil_world.py (cached; treat as read-only)"""
     
     # Based on analysis of plants/oil-refinery/oil_world.py
     inventory = {
@@ -145,6 +158,29 @@ def analyze_oil_refinery_plant() -> Dict:
     
     return inventory
 
+def _rows(plant: Dict, category: str) -> Iterator[Tuple]:
+    """Yield tag list rows for one category of a plant inventory"""
+    plant_name = plant["plant"]
+    return ((tag["name"], tag["type"], tag["address"], tag["role"], plant_name, tag["description"])
+            for tag in plant.get(category, []))
+
+def _write_json(inventory: Dict):
+    """Write the JSON inventory report (orjson when available)"""
+    if orjson is not None:
+        with open("reports/inventory.json", "wb") as f:
+            f.write(orjson.dumps(inventory, option=orjson.OPT_INDENT_2))
+    else:
+        with open("reports/inventory.json", "w") as f:
+            json.dump(inventory, f, indent=2)
+
+def _write_csv(all_tags: List[Tuple]):
+    """Write the CSV tag list report"""
+    with open("reports/taglist.csv", "w", newline="") as f:
+        if all_tags:
+            writer = csv.writer(f)
+            writer.writerow(TAGLIST_COLUMNS)
+            writer.writerows(all_tags)
+
 def generate_inventory_report():
     """Generate the inventory report"""
     
@@ -162,51 +198,19 @@ def generate_inventory_report():
         }
     }
     
-    # Write JSON report
-    with open("reports/inventory.json", "w") as f:
-        json.dump(full_inventory, f, indent=2)
-    
     # Generate CSV tag list
-    all_tags = []
-    
-    for plant in [bottle_inventory, refinery_inventory]:
-        for sensor in plant["sensors"]:
-            all_tags.append({
-                "name": sensor["name"],
-                "type": sensor["type"],
-                "address": sensor["address"],
-                "role": sensor["role"],
-                "plant": plant["plant"],
-                "description": sensor["description"]
-            })
-        
-        for actuator in plant["actuators"]:
-            all_tags.append({
-                "name": actuator["name"],
-                "type": actuator["type"],
-                "address": actuator["address"],
-                "role": actuator["role"],
-                "plant": plant["plant"],
-                "description": actuator["description"]
-            })
-        
-        if "commands" in plant:
-            for cmd in plant["commands"]:
-                all_tags.append({
-                    "name": cmd["name"],
-                    "type": cmd["type"],
-                    "address": cmd["address"],
-                    "role": cmd["role"],
-                    "plant": plant["plant"],
-                    "description": cmd["description"]
-                })
+    all_tags = list(itertools.chain.from_iterable(
+        _rows(plant, category)
+        for plant in (bottle_inventory, refinery_inventory)
+        for category in ("sensors", "actuators", "commands")
+    ))
     
-    # Write CSV report
-    with open("reports/taglist.csv", "w", newline="") as f:
-        if all_tags:
-            writer = csv.DictWriter(f, fieldnames=all_tags[0].keys())
-            writer.writeheader()
-            writer.writerows(all_tags)
+    # Write JSON and CSV reports concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        json_future = executor.submit(_write_json, full_inventory)
+        csv_future = executor.submit(_write_csv, all_tags)
+        json_future.result()
+        csv_future.result()
     
     print(f"Generated inventory report with {full_inventory['summary']['total_sensors']} sensors, {full_inventory['summary']['total_actuators']} actuators")
     print("Files created: reports/inventory.json, reports/taglist.csv")
@@ -5,11 +5,16 @@ Validates complete system from ST to physics and back
 """
 
 import asyncio
+import logging
+import queue
 import time
 import json
 import sys
+from collections import Counter
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
@@ -18,54 +23,150 @@ from sim.common.modbus_bridge import ModbusBridge
 from sim.common.physics import create_physics_engine
 from sim.common.attack_injector import AttackManager, AttackType, AttackConfig
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Per-test status lines at INFO; run_roundtrip_tests drains them to stdout on a worker thread.
+# Callers driving RoundTripTester directly must configure logging themselves, since
+# logging's last-resort handler drops INFO records.
+logger = logging.getLogger("roundtrip")
+
+def _start_log_listener() -> Tuple[QueueHandler, QueueListener]:
+    """Route round-trip logging through a queue so tests only enqueue records"""
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    
+    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, stdout_handler)
+    listener.start()
+    return queue_handler, listener
+
+def _load_ir(ir_path: Path) -> Dict[str, Any]:
+    """Read and parse an IR JSON file (orjson when available)"""
+    data = ir_path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+@lru_cache(maxsize=8)
+def _load_ir_cached(ir_file: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse an IR file once per (path, mtime); callers must treat the result as read-only"""
+    return _load_ir(Path(ir_file))
+
+def _load_current_ir(ir_path: Path) -> Dict[str, Any]:
+    """Load an IR file through the cache, reparsing only after it changes on disk"""
+    return _load_ir_cached(str(ir_path), ir_path.stat().st_mtime_ns)
+
+def _save_results(results: Dict[str, Any], results_file: str):
+    """Write the round-trip results JSON report (orjson when available)"""
+    results_path = Path(results_file)
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        results_path.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    else:
+        with open(results_path, "w") as f:
+            json.dump(results, f, indent=2)
+
 class RoundTripTester:
     """Round-trip test suite for VirtuaPlant"""
     
-    def __init__(self, plant_type: str):
+    # Pass thresholds for the physics checks
+    BOTTLE_POS_THRESHOLD = 130.0
+    TANK_LEVEL_THRESHOLD = 20.0
+    BOTTLE_LEVEL_THRESHOLD = 0.5
+    OIL_SPILL_THRESHOLD = 0.0
+    
+    def __init__(self, plant_type: str, realtime: bool = False):
         self.plant_type = plant_type
         self.modbus_bridge = ModbusBridge(plant_type)
         self.physics = create_physics_engine(plant_type)
         self.attack_manager = AttackManager(self.modbus_bridge)
+        self.ir_path = Path("ir") / f"{plant_type}_crossplc.json"
+        
+        # Pace physics steps in real time, or just yield to the loop
+        self.realtime = realtime
+        self.step_delay = 0.01 if realtime else 0
         
         # Test results
         self.test_results = []
         
     async def run_all_tests(self) -> Dict[str, Any]:
         """Run all round-trip tests"""
-        print(f"🧪 Running round-trip tests for {self.plant_type} plant...")
+        logger.info("🧪 Running round-trip tests for %s plant...", self.plant_type)
         
-        tests = [
+        # Tests that step physics or drive the bridge must run in order
+        serial_tests = [
             ("Basic Physics", self._test_basic_physics),
             ("Sensor Validation", self._test_sensor_validation),
             ("Actuator Control", self._test_actuator_control),
             ("Alarm Conditions", self._test_alarm_conditions),
             ("Attack Injection", self._test_attack_injection),
-            ("Modbus Consistency", self._test_modbus_consistency),
+            ("Modbus Consistency", self._test_modbus_consistency)
+        ]
+        
+        # Tests that never touch the bridge or physics can overlap them
+        parallel_tests = [
             ("CrossPLC IR Validation", self._test_crossplc_ir_validation)
         ]
         
-        for test_name, test_func in tests:
-            print(f"\n--- Running {test_name} ---")
-            try:
-                result = await test_func()
-                self.test_results.append({
-                    "test": test_name,
-                    "status": "PASS" if result else "FAIL",
-                    "details": result
-                })
-                print(f"✅ {test_name}: PASS")
-            except Exception as e:
-                self.test_results.append({
-                    "test": test_name,
-                    "status": "ERROR",
-                    "details": str(e)
-                })
-                print(f"❌ {test_name}: ERROR - {e}")
+        # One result slot per test, filled in place in the original test order
+        self.test_results = [None] * (len(serial_tests) + len(parallel_tests))
+        
+        async def run_serial():
+            for index, (test_name, test_func) in enumerate(serial_tests):
+                await self._run_test(index, test_name, test_func)
+        
+        await asyncio.gather(
+            run_serial(),
+            *(self._run_test(index, test_name, test_func)
+              for index, (test_name, test_func) in enumerate(parallel_tests, len(serial_tests)))
+        )
         
         # Generate summary
         summary = self._generate_summary()
         return summary
     
+    async def _run_test(self, index: int, test_name: str, test_func):
+        """Run one test into its result slot, capturing failures so sibling tests keep running"""
+        logger.info("\n--- [%s] Running %s ---", self.plant_type, test_name)
+        try:
+            result = await test_func()
+            status = "PASS" if result else "FAIL"
+            logger.info("%s [%s] %s: %s", "✅" if result else "❌", self.plant_type, test_name, status)
+        except Exception as e:
+            result = str(e)
+            status = "ERROR"
+            logger.info("❌ [%s] %s: ERROR - %s", self.plant_type, test_name, e)
+        
+        self.test_results[index] = {
+            "test": test_name,
+            "status": status,
+            "details": result
+        }
+    
+    async def _step_physics(self, max_steps: int,
+                            until: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Dict[str, Any]:
+        """Step physics against the bridge until `until` holds or max_steps run, returning the last sensor values"""
+        get_actuator_values = self.modbus_bridge.get_actuator_values
+        update_sensors = self.modbus_bridge.update_sensors
+        update_physics = self.physics.update
+        step_delay = self.step_delay
+        
+        sensor_values = {}
+        for _ in range(max_steps):
+            sensor_values = update_physics(0.02, get_actuator_values())
+            update_sensors(sensor_values)
+            if until is not None and until(sensor_values):
+                break
+            await asyncio.sleep(step_delay)
+        return sensor_values
+    
     async def _test_basic_physics(self) -> bool:
         """Test basic physics simulation"""
         # Set initial conditions
@@ -77,20 +178,14 @@ class RoundTripTester:
             self.modbus_bridge.set_tag_value('ACT_FEED_PUMP', True)
             self.modbus_bridge.set_tag_value('ACT_OUTLET_VALVE', False)
         
-        # Run physics for several steps
-        for i in range(10):
-            actuator_values = self.modbus_bridge.get_actuator_values()
-            sensor_values = self.physics.update(0.02, actuator_values)
-            self.modbus_bridge.update_sensors(sensor_values)
-            await asyncio.sleep(0.01)
-        
         # Check that physics responded
         if self.plant_type == "bottle":
-            bottle_position = sensor_values.get('bottle_position', 0)
-            return bottle_position > 130.0  # Bottle should have moved
+            responded = lambda sv: sv['bottle_position'] > self.BOTTLE_POS_THRESHOLD  # Bottle should have moved
         else:
-            tank_level = sensor_values.get('SENSOR_TANK_LEVEL', 0)
-            return tank_level > 20  # Tank level should have increased
+            responded = lambda sv: sv['SENSOR_TANK_LEVEL'] > self.TANK_LEVEL_THRESHOLD  # Tank level should have increased
+        
+        # Run physics until it responds, for at most 10 steps
+        return responded(await self._step_physics(10, responded))
     
     async def _test_sensor_validation(self) -> bool:
         """Test sensor validation and updates"""
@@ -149,31 +244,17 @@ class RoundTripTester:
             })
             self.modbus_bridge.set_tag_value('ACT_NOZZLE', True)
             
-            # Run physics to trigger alarm
-            for i in range(5):
-                actuator_values = self.modbus_bridge.get_actuator_values()
-                sensor_values = self.physics.update(0.02, actuator_values)
-                self.modbus_bridge.update_sensors(sensor_values)
-                await asyncio.sleep(0.01)
-            
-            # Check that bottle level increased
-            bottle_level = sensor_values.get('bottle_level', 0)
-            return bottle_level > 0.5
+            # Run physics until the bottle level increases, for at most 5 steps
+            level_increased = lambda sv: sv['bottle_level'] > self.BOTTLE_LEVEL_THRESHOLD
+            return level_increased(await self._step_physics(5, level_increased))
         else:
             # Test spill alarm condition
             self.modbus_bridge.set_tag_value('ACT_FEED_PUMP', True)
             self.modbus_bridge.update_sensors({'SENSOR_TANK_LEVEL': 95})  # High level
             
-            # Run physics to trigger spill
-            for i in range(10):
-                actuator_values = self.modbus_bridge.get_actuator_values()
-                sensor_values = self.physics.update(0.02, actuator_values)
-                self.modbus_bridge.update_sensors(sensor_values)
-                await asyncio.sleep(0.01)
-            
-            # Check that spill was detected
-            oil_spilled = sensor_values.get('oil_spilled', 0)
-            return oil_spilled > 0
+            # Run physics until a spill is detected, for at most 10 steps
+            spill_detected = lambda sv: sv['oil_spilled'] > self.OIL_SPILL_THRESHOLD
+            return spill_detected(await self._step_physics(10, spill_detected))
     
     async def _test_attack_injection(self) -> bool:
         """Test attack injection functionality"""
@@ -187,8 +268,8 @@ class RoundTripTester:
         
         attack_id = self.attack_manager.injector.start_attack(config)
         
-        # Let attack run for a moment
-        await asyncio.sleep(1.0)
+        # The attack is registered synchronously; only dwell when pacing in real time
+        await asyncio.sleep(1.0 if self.realtime else 0)
         
         # Check that attack is active
         active_attacks = self.attack_manager.injector.list_attacks()
@@ -202,55 +283,45 @@ class RoundTripTester:
     async def _test_modbus_consistency(self) -> bool:
         """Test Modbus consistency and tag mappings"""
         # Check that all tags in the map are accessible
-        all_tags = list(self.modbus_bridge.tag_mappings.keys())
+        tag_mappings = self.modbus_bridge.tag_mappings
         
-        for tag in all_tags:
-            try:
-                # Try to read the tag
-                value = self.modbus_bridge.get_tag_value(tag)
-                # Try to write to the tag (if it's writable)
-                if self.modbus_bridge.tag_mappings[tag]['role'] in ['Actuator', 'Command']:
-                    self.modbus_bridge.set_tag_value(tag, value)
-            except Exception as e:
-                print(f"❌ Tag {tag} failed consistency check: {e}")
-                return False
+        try:
+            # Read every tag, then write back the writable ones, in batched requests
+            values = self.modbus_bridge.get_tag_values(list(tag_mappings))
+            self.modbus_bridge.set_tag_values({
+                tag: values[tag] for tag, mapping in tag_mappings.items()
+                if mapping['role'] in ['Actuator', 'Command']
+            })
+        except Exception as e:
+            logger.info("❌ [%s] Tags failed consistency check: %s", self.plant_type, e)
+            return False
         
         return True
     
     async def _test_crossplc_ir_validation(self) -> bool:
         """Test CrossPLC IR validation"""
-        # Check that IR file exists
-        ir_file = f"ir/{self.plant_type}_crossplc.json"
-        if not Path(ir_file).exists():
-            print(f"⚠️ IR file not found: {ir_file}")
+        # Load IR data off the event loop, treating a missing file as a failure
+        try:
+            ir_data = await asyncio.get_running_loop().run_in_executor(None, _load_current_ir, self.ir_path)
+        except FileNotFoundError:
+            logger.info("⚠️ [%s] IR file not found: %s", self.plant_type, self.ir_path)
             return False
         
-        # Load IR data
-        with open(ir_file, 'r') as f:
-            ir_data = json.load(f)
-        
         # Check that IR contains expected components
-        if 'detailed_components' not in ir_data:
+        components = ir_data.get('detailed_components')
+        if components is None:
             return False
         
-        # Check that tags are present
-        for plc_name, plc_data in ir_data['detailed_components'].items():
-            if 'tags' not in plc_data:
-                return False
-            
-            # Check that some tags exist
-            tags = plc_data['tags'].get('controller_tags', [])
-            if not tags:
-                return False
-        
-        return True
+        # Check in one pass that every PLC has some controller tags
+        return all(plc_data.get('tags', {}).get('controller_tags') for plc_data in components.values())
     
     def _generate_summary(self) -> Dict[str, Any]:
         """Generate test summary"""
         total_tests = len(self.test_results)
-        passed_tests = sum(1 for r in self.test_results if r['status'] == 'PASS')
-        failed_tests = sum(1 for r in self.test_results if r['status'] == 'FAIL')
-        error_tests = sum(1 for r in self.test_results if r['status'] == 'ERROR')
+        status_counts = Counter(r['status'] for r in self.test_results)
+        passed_tests = status_counts['PASS']
+        failed_tests = status_counts['FAIL']
+        error_tests = status_counts['ERROR']
         
         summary = {
             "plant_type": self.plant_type,
@@ -270,15 +341,20 @@ async def run_roundtrip_tests():
     print("🧪 VirtuaPlant Round-trip Test Suite")
     print("=" * 50)
     
-    all_results = {}
+    # Plants share no state, so run their suites concurrently
+    testers = {plant_type: RoundTripTester(plant_type) for plant_type in ["bottle", "refinery"]}
+    queue_handler, listener = _start_log_listener()
+    try:
+        results_list = await asyncio.gather(*(tester.run_all_tests() for tester in testers.values()))
+    finally:
+        # Drain queued status lines before printing summaries
+        listener.stop()
+        logger.removeHandler(queue_handler)
+    all_results = dict(zip(testers, results_list))
     
-    for plant_type in ["bottle", "refinery"]:
+    for plant_type, results in all_results.items():
         print(f"\n{'='*20} {plant_type.upper()} PLANT {'='*20}")
         
-        tester = RoundTripTester(plant_type)
-        results = await tester.run_all_tests()
-        all_results[plant_type] = results
-        
         # Print summary
         print(f"\n📊 {plant_type.title()} Plant Test Summary:")
         print(f"  Total Tests: {results['total_tests']}")
@@ -300,9 +376,9 @@ async def run_roundtrip_tests():
     print(f"Total Passed: {total_passed}")
     print(f"Overall Success Rate: {overall_success_rate:.1%}")
     
-    # Save results
-    with open("reports/roundtrip_test_results.json", "w") as f:
-        json.dump(all_results, f, indent=2)
+    # Save results off the event loop
+    await asyncio.get_running_loop().run_in_executor(
+        None, _save_results, all_results, "reports/roundtrip_test_results.json")
     
     print(f"\n📄 Test results saved to: reports/roundtrip_test_results.json")
     
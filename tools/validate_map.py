@@ -5,109 +5,138 @@ Validates Modbus maps for unique addresses, consistent types, and policy complia
 """
 
 import csv
+import re
 import yaml
 import sys
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Addresses are decimal or 0x-prefixed hex; width is decimal or empty (defaults to 1).
+# Surrounding whitespace is allowed; signs, underscores and non-ASCII digits are not.
+ADDRESS_RE = re.compile(r"\A\s*(?:0x[0-9A-Fa-f]+|\d+)\s*\Z", re.ASCII)
+WIDTH_RE = re.compile(r"\A(?:\s*\d+\s*)?\Z", re.ASCII)
+
+# libyaml-backed loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 def load_tag_policy() -> Dict:
     """Load the tag policy from policy/tags.yaml"""
     with open("policy/tags.yaml", "r") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=YAML_LOADER)
+
+def compile_prefix_rules(rules: Dict[str, Any]) -> Tuple[Tuple[str, ...], List[Tuple[str, Any]]]:
+    """Compile 'PREFIX*' policy rules into a prefix tuple and longest-first (prefix, value) pairs"""
+    pairs = [(pattern[:-1], value) for pattern, value in rules.items() if pattern.endswith("*")]
+    pairs.sort(key=lambda pair: len(pair[0]), reverse=True)
+    return tuple(prefix for prefix, _ in pairs), pairs
+
+def match_prefix_rule(tag_name: str, compiled: Tuple[Tuple[str, ...], List[Tuple[str, Any]]]) -> Any:
+    """Return the value of the longest rule prefix matching tag_name, or None"""
+    prefixes, pairs = compiled
+    if tag_name.startswith(prefixes):
+        for prefix, value in pairs:
+            if tag_name.startswith(prefix):
+                return value
+    return None
 
-def validate_modbus_map(map_file: str) -> Dict:
-    """Validate a single Modbus map file"""
+def validate_modbus_map(map_file: str, policy: Optional[Dict] = None) -> Dict:
+    """Validate a single Modbus map file (loads the tag policy if not given)"""
     
-    policy = load_tag_policy()
-    errors = []
-    warnings = []
+    if policy is None:
+        policy = load_tag_policy()
     
-    # Read the map file
-    with open(map_file, "r") as f:
-        reader = csv.DictReader(f)
-        tags = list(reader)
+    # Compile policy rules once per map instead of scanning them per tag
+    prefix_tuple = tuple(policy["prefixes"].values())
+    prefix_message = str(list(prefix_tuple))
+    role_rules = compile_prefix_rules(policy["roles"])
+    type_rules = compile_prefix_rules(policy["type_rules"])
+    table_rules = compile_prefix_rules(policy["modbus_tables"])
     
-    # Check for required columns
-    required_columns = ["name", "type", "table", "address", "width", "units", "desc", "role"]
-    missing_columns = [col for col in required_columns if col not in tags[0].keys()]
-    if missing_columns:
-        errors.append(f"Missing required columns: {missing_columns}")
+    errors = []
+    warnings = []
     
     # Track addresses for uniqueness check
     addresses = {}
+    total_tags = 0
     
-    for i, tag in enumerate(tags, 1):
-        # Check tag naming policy
-        tag_name = tag.get("name", "")
-        if not tag_name:
-            errors.append(f"Row {i}: Missing tag name")
-            continue
-            
-        # Check prefix compliance
-        valid_prefix = False
-        for prefix in policy["prefixes"].values():
-            if tag_name.startswith(prefix):
-                valid_prefix = True
-                break
-        
-        if not valid_prefix:
-            errors.append(f"Row {i}: Tag '{tag_name}' doesn't follow naming policy (should start with {list(policy['prefixes'].values())})")
-        
-        # Check role consistency
-        expected_role = None
-        for pattern, role in policy["roles"].items():
-            if pattern.endswith("*") and tag_name.startswith(pattern[:-1]):
-                expected_role = role
-                break
-        
-        actual_role = tag.get("role", "")
-        if expected_role and actual_role != expected_role:
-            errors.append(f"Row {i}: Tag '{tag_name}' has role '{actual_role}' but should be '{expected_role}'")
-        
-        # Check type consistency
-        expected_types = []
-        for pattern, types in policy["type_rules"].items():
-            if pattern.endswith("*") and tag_name.startswith(pattern[:-1]):
-                expected_types = types
-                break
-        
-        actual_type = tag.get("type", "")
-        if expected_types and actual_type not in expected_types:
-            errors.append(f"Row {i}: Tag '{tag_name}' has type '{actual_type}' but should be one of {expected_types}")
-        
-        # Check Modbus table consistency
-        expected_table = None
-        for pattern, table in policy["modbus_tables"].items():
-            if pattern.endswith("*") and tag_name.startswith(pattern[:-1]):
-                expected_table = table
-                break
+    # Stream the map file row by row
+    with open(map_file, "r") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        col_idx = {column: index for index, column in enumerate(header)}
         
-        actual_table = tag.get("table", "")
-        if expected_table and actual_table != expected_table:
-            warnings.append(f"Row {i}: Tag '{tag_name}' uses table '{actual_table}' but policy suggests '{expected_table}'")
+        # Check for required columns
+        required_columns = ["name", "type", "table", "address", "width", "units", "desc", "role"]
+        missing_columns = [col for col in required_columns if col not in col_idx]
+        if missing_columns:
+            errors.append(f"Missing required columns: {missing_columns}")
         
-        # Check address uniqueness
-        address = tag.get("address", "")
-        table = tag.get("table", "")
-        address_key = f"{table}:{address}"
+        # Absent columns index one trailing "" field appended to every row
+        n_fields = len(header)
+        name_i, type_i, table_i, address_i, width_i, role_i = (
+            col_idx.get(column, n_fields)
+            for column in ("name", "type", "table", "address", "width", "role")
+        )
         
-        if address_key in addresses:
-            errors.append(f"Row {i}: Duplicate address {address_key} (already used by '{addresses[address_key]}')")
-        else:
-            addresses[address_key] = tag_name
-        
-        # Validate address format
-        try:
-            if address.startswith("0x"):
-                int(address, 16)
+        # Blank lines are skipped, as csv.DictReader does
+        for i, row in enumerate(filter(None, reader), 1):
+            total_tags = i
+            if len(row) == n_fields:
+                row.append("")
             else:
-                int(address)
-        except ValueError:
-            errors.append(f"Row {i}: Invalid address format '{address}'")
+                # Short rows read missing fields as None, as csv.DictReader does
+                row = row[:n_fields] + [None] * (n_fields - len(row)) + [""]
+            
+            # Check tag naming policy
+            tag_name = row[name_i]
+            if not tag_name:
+                errors.append(f"Row {i}: Missing tag name")
+                continue
+                
+            # Check prefix compliance
+            if not tag_name.startswith(prefix_tuple):
+                errors.append(f"Row {i}: Tag '{tag_name}' doesn't follow naming policy (should start with {prefix_message})")
+            
+            # Check role consistency
+            expected_role = match_prefix_rule(tag_name, role_rules)
+            
+            actual_role = row[role_i]
+            if expected_role and actual_role != expected_role:
+                errors.append(f"Row {i}: Tag '{tag_name}' has role '{actual_role}' but should be '{expected_role}'")
+            
+            # Check type consistency
+            expected_types = match_prefix_rule(tag_name, type_rules) or []
+            
+            actual_type = row[type_i]
+            if expected_types and actual_type not in expected_types:
+                errors.append(f"Row {i}: Tag '{tag_name}' has type '{actual_type}' but should be one of {expected_types}")
+            
+            # Check Modbus table consistency
+            expected_table = match_prefix_rule(tag_name, table_rules)
+            
+            actual_table = row[table_i]
+            if expected_table and actual_table != expected_table:
+                warnings.append(f"Row {i}: Tag '{tag_name}' uses table '{actual_table}' but policy suggests '{expected_table}'")
+            
+            # Check address uniqueness
+            address = row[address_i]
+            address_key = f"{actual_table}:{address}"
+            if address_key in addresses:
+                errors.append(f"Row {i}: Duplicate address {address_key} (already used by '{addresses[address_key]}')")
+            else:
+                addresses[address_key] = tag_name
+            
+            # Validate address and width format
+            if not ADDRESS_RE.match(address):
+                errors.append(f"Row {i}: Invalid address format '{address}'")
+            
+            width = row[width_i] or ""
+            if not WIDTH_RE.match(width):
+                errors.append(f"Row {i}: Invalid width '{width}'")
     
     return {
         "file": map_file,
-        "total_tags": len(tags),
+        "total_tags": total_tags,
         "errors": errors,
         "warnings": warnings,
         "valid": len(errors) == 0
@@ -123,9 +152,12 @@ def main():
     map_files = sys.argv[1:]
     all_valid = True
     
+    # Parse the policy once for all map files
+    policy = load_tag_policy()
+    
     for map_file in map_files:
         print(f"\nValidating {map_file}...")
-        result = validate_modbus_map(map_file)
+        result = validate_modbus_map(map_file, policy)
         
         print(f"  Total tags: {result['total_tags']}")
         